@@ -0,0 +1,240 @@
+"""
+Manual evaluation trigger for a Redmine issue.
+
+Single implementation behind the top-level test_evaluation.py shim, so
+the fetch/build/trigger logic is parsed once and cannot drift between
+copies.
+Usage:
+  docker exec ai-evaluator python /app/test_evaluation.py 691332
+"""
+
+import os
+import sys
+import argparse
+import orjson
+import requests
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+
+# Shared session so repeated calls reuse pooled TCP connections instead
+# of paying a fresh handshake per request
+session = requests.Session()
+_adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=8)
+session.mount("http://", _adapter)
+session.mount("https://", _adapter)
+session.headers.update({"Accept": "application/json"})
+
+# Redmine custom field id -> (payload key, default). One table instead
+# of eleven hand-numbered lookups in build_evaluation_request.
+_CF_MAP = {
+    43: ("issue_type", "manual"),
+    44: ("alarming_state", "false"),
+    45: ("class_id", ""),
+    46: ("issue_resolve_method", ""),
+    47: ("issue_resolve_in", ""),
+    48: ("issue_resolve_by", ""),
+    49: ("issue_resolve_at", ""),
+    54: ("collector_name", ""),
+    55: ("trigger_name", ""),
+    56: ("known_error_id", ""),
+    57: ("zabbix_event_id", ""),
+}
+
+
+def fetch_issue_from_mcp(issue_id: int) -> dict:
+    """Fetch issue data from MCP server using Strands MCP client."""
+    mcp_base_url = os.getenv("MCP_BASE_URL", "http://localhost:8000/mcp/")
+    mcp_api_key = os.getenv("MCP_API_KEY", "")
+
+    if not mcp_api_key:
+        print("❌ Error: MCP_API_KEY environment variable not set")
+        sys.exit(1)
+
+    print(f"🔍 Fetching issue #{issue_id} from MCP server...")
+
+    try:
+        # Import MCP client (same as ai-evaluator uses)
+        from ai_evaluator.mcp_client import MCPClient
+        import asyncio
+        import uuid
+
+        # Create and start MCP client
+        mcp_client = MCPClient(base_url=mcp_base_url, api_key=mcp_api_key)
+        mcp_client.start()
+
+        # Call get_redmine_issue tool (using same signature as ai-agents)
+        async def fetch():
+            tool_use_id = f"test-{issue_id}-{uuid.uuid4().hex[:8]}"
+            return await mcp_client._client.call_tool_async(
+                tool_use_id=tool_use_id,
+                name="get_redmine_issue",
+                arguments={"issue_id": issue_id, "include_journals": True, "include_attachments": False}
+            )
+
+        result = asyncio.run(fetch())
+
+        # Parse the MCP response (dict format)
+        if result and isinstance(result, dict) and 'content' in result and len(result['content']) > 0:
+            text_content = result['content'][0]['text']
+            if isinstance(text_content, str):
+                # orjson: issues with many journals can be large payloads
+                issue_data = orjson.loads(text_content)
+            else:
+                issue_data = text_content
+
+            print(f"✓ Found issue: {issue_data.get('subject', 'Unknown')[:60]}...")
+            asyncio.run(mcp_client.close())
+            return issue_data
+        else:
+            print(f"❌ Error: No data returned from MCP server")
+            print(f"   Result type: {type(result)}")
+            print(f"   Result: {result}")
+            asyncio.run(mcp_client.close())
+            sys.exit(1)
+
+    except Exception as e:
+        print(f"❌ Error fetching issue from MCP: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+@dataclass(slots=True)
+class EvaluationRequest:
+    """Evaluation request payload; slots keep the per-call allocation flat."""
+    issue_id: int
+    project_id: int
+    project_identifier: str
+    subject: str
+    description: str
+    author: str
+    tracker: str
+    status: str
+    priority: str
+    created_on: str
+    updated_on: str
+    issue_type: str
+    alarming_state: str
+    class_id: str
+    issue_resolve_method: str
+    issue_resolve_in: str
+    issue_resolve_by: str
+    issue_resolve_at: str
+    collector_name: str
+    trigger_name: str
+    known_error_id: str
+    zabbix_event_id: str
+
+
+def build_evaluation_request(issue_data: dict) -> EvaluationRequest:
+    """Build evaluation request payload from Redmine issue data."""
+    # Get custom fields
+    custom_fields = {cf["id"]: cf.get("value", "") for cf in issue_data.get("custom_fields", [])}
+
+    return EvaluationRequest(
+        issue_id=issue_data["id"],
+        project_id=issue_data["project"]["id"],
+        project_identifier=issue_data["project"].get("identifier", "unknown"),
+        subject=issue_data["subject"],
+        description=issue_data.get("description", ""),
+        author=issue_data.get("author", {}).get("name", "Unknown"),
+        tracker=issue_data.get("tracker", {}).get("name", "Unknown"),
+        status=issue_data.get("status", {}).get("name", "Unknown"),
+        priority=issue_data.get("priority", {}).get("name", "Unknown"),
+        created_on=issue_data.get("created_on", datetime.now(timezone.utc).isoformat()),
+        updated_on=issue_data.get("updated_on", datetime.now(timezone.utc).isoformat()),
+        **{
+            key: custom_fields.get(field_id, default)
+            for field_id, (key, default) in _CF_MAP.items()
+        },
+    )
+
+
+def trigger_evaluation(issue_id: int, evaluator_url: str = "http://localhost:8002/evaluate"):
+    """Trigger evaluation for a specific issue."""
+    username = os.getenv("SERVICE_USERNAME", "evaluator")
+    password = os.getenv("SERVICE_PASSWORD", "changeme")
+
+    # Fetch issue from MCP server
+    issue_data = fetch_issue_from_mcp(issue_id)
+
+    # Build evaluation request
+    request_payload = build_evaluation_request(issue_data)
+
+    print(f"\n📊 Triggering evaluation for issue #{issue_id}...")
+    print(f"   URL: {evaluator_url}")
+    print(f"   Project: {request_payload.project_identifier}")
+    print(f"   Status: {request_payload.status}")
+    print(f"   Type: {request_payload.issue_type}")
+
+    try:
+        # orjson encode instead of requests' stdlib json= path
+        response = session.post(
+            evaluator_url,
+            data=orjson.dumps(asdict(request_payload)),
+            headers={"Content-Type": "application/json"},
+            auth=(username, password),
+            timeout=120  # Evaluations can take 30-60s
+        )
+
+        response.raise_for_status()
+        result = response.json()
+
+        print(f"\n✅ Evaluation completed!")
+        print(f"   Success: {result.get('success')}")
+        print(f"   Message: {result.get('message')}")
+
+        if result.get("evaluation"):
+            eval_data = result["evaluation"]
+            if "metrics" in eval_data:
+                metrics = eval_data["metrics"]
+                print(f"\n📈 Evaluation Metrics:")
+                print(f"   Solution Quality: {metrics.get('solution_quality', 'N/A')}/10")
+                print(f"   Adherence to Solution: {metrics.get('adherence_to_solution', 'N/A')}/10")
+                print(f"   Operator Effort: {metrics.get('operator_effort', 'N/A')}/10")
+                print(f"   Automation Potential: {metrics.get('automation_potential', 'N/A')}/10")
+                print(f"   Resolution Efficiency: {metrics.get('resolution_efficiency', 'N/A')}/10")
+
+            if "summary" in eval_data:
+                print(f"\n📝 Summary:")
+                print(f"   {eval_data['summary'][:200]}...")
+
+        return result
+
+    except requests.exceptions.Timeout:
+        print(f"\n❌ Error: Evaluation timed out after 120 seconds")
+        print(f"   Check ai-evaluator logs for details")
+        sys.exit(1)
+
+    except requests.exceptions.RequestException as e:
+        print(f"\n❌ Error triggering evaluation: {e}")
+        if hasattr(e.response, 'text'):
+            print(f"   Response: {e.response.text[:200]}")
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Trigger manual evaluation for a Redmine issue",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Trigger evaluation for issue
+  python test_evaluation.py 691332
+
+  # With custom evaluator URL
+  python test_evaluation.py 691332 --url http://localhost:8002/evaluate
+        """
+    )
+
+    parser.add_argument("issue_id", type=int, help="Redmine issue ID to evaluate")
+    parser.add_argument("--url", "-u", default="http://localhost:8002/evaluate",
+                        help="Evaluator service URL (default: http://localhost:8002/evaluate)")
+
+    args = parser.parse_args()
+
+    trigger_evaluation(args.issue_id, args.url)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,53 +1,307 @@
 """ClickHouse client for storing evaluation results."""
 
+import asyncio
+import gzip
 import logging
-from typing import Optional, Dict, Any
-from datetime import datetime
+import re
+import struct
+from functools import lru_cache
+from typing import Callable, Final, List, Optional, Dict, Any, Tuple
+from datetime import datetime, timezone
 import httpx
-from urllib.parse import urljoin
+from urllib.parse import urljoin, urlparse
+
+try:
+    import asynch
+except ImportError:  # Native protocol support is optional
+    asynch = None
 
 logger = logging.getLogger(__name__)
 
+# Default for DateTime columns with no source value
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+# Values of the improvement_priority Enum8 column
+_PRIORITY_ENUM = {"low": 1, "medium": 2, "high": 3}
+
+# Characters that must be escaped in ClickHouse string literals;
+# str.translate with a precomputed table is a single C-level pass and
+# beats both chained str.replace and regex substitution on large text
+_ESCAPE_TABLE = str.maketrans({"\\": "\\\\", "'": "\\'"})
+
+# Bodies above this size are gzip-compressed before POSTing
+_GZIP_THRESHOLD = 4096
+
+# Queued by close() to stop the flusher after in-flight rows are flushed
+_CLOSE_SENTINEL: Final = object()
+
+# HTTP-style {name:Type} placeholder, e.g. {limit:UInt32}
+_HTTP_PARAM_RE = re.compile(r"\{(\w+):[\w()]+\}")
+
+# Trailing output-format directive, e.g. "FORMAT JSONCompact"
+_FORMAT_CLAUSE_RE = re.compile(r"\s+FORMAT\s+\w+\s*$", re.IGNORECASE)
+
+
+def _to_pyformat(query: str) -> str:
+    """
+    Rewrite {name:Type} placeholders as %(name)s for the native driver.
+
+    Server-side parameter binding is an HTTP-interface feature; the
+    native protocol sends plain SQL, so queries written for HTTP would
+    reach the server with literal placeholders. The driver substitutes
+    (and escapes) %(name)s params client-side instead.
+    """
+    return _HTTP_PARAM_RE.sub(lambda match: f"%({match.group(1)})s", query)
+
+
+@lru_cache(maxsize=1024)
+def _parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """
+    Parse an ISO timestamp into an aware datetime, or None.
+
+    Cached because the same raw timestamps recur across retries and
+    re-evaluations of an issue.
+    """
+    if not value:
+        return None
+    try:
+        dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError as e:
+        logger.warning("Could not parse timestamp '%s': %s", value, e)
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt
+
+
+# Columns for the batched INSERT; emitted once per flush, not per row
+_INSERT_COLUMNS: Final[bytes] = (
+    b"issue_id, project_id, project_identifier, evaluated_at, "
+    b"issue_created_at, issue_closed_at, resolution_time_seconds, "
+    b"subject, description, author, tracker, status, priority, "
+    b"issue_type, class_id, evaluation_model, solution_quality, "
+    b"adherence_to_solution, operator_effort, automation_potential, "
+    b"resolution_efficiency, overall_score, solution_quality_notes, "
+    b"adherence_notes, operator_effort_notes, automation_recommendations, "
+    b"efficiency_notes, summary, improvement_priority, automation_candidate, "
+    b"requires_attention, resolve_method, resolve_by, alarming_state, "
+    b"raw_response"
+)
+_INSERT_HEADER: Final[bytes] = b"INSERT INTO ai_evaluations (" + _INSERT_COLUMNS + b") VALUES "
+_INSERT_HEADER_ROWBINARY: Final[bytes] = b"INSERT INTO ai_evaluations (" + _INSERT_COLUMNS + b") FORMAT RowBinary\n"
+
+# ClickHouse type of each insert column, in _INSERT_COLUMNS order;
+# drives both the VALUES renderer and the RowBinary encoder
+_COLUMN_TYPES: Final[Tuple[str, ...]] = (
+    "u32", "u32", "str", "dt",
+    "dt", "dt", "u32",
+    "str", "str", "str", "str", "str", "str",
+    "str", "str", "str", "u8",
+    "u8", "u8", "u8",
+    "u8", "f32", "str",
+    "str", "str", "str",
+    "str", "str", "enum8", "u8",
+    "u8", "str", "str", "str",
+    "str"
+)
+
+
+class AsyncWriteBuffer:
+    """
+    Background write buffer that coalesces rows into multi-row INSERTs.
+
+    Rows pushed via put() accumulate in an asyncio.Queue; a background
+    task flushes them in a single batch whenever max_rows rows are
+    pending or the oldest pending row is max_age_ms old, whichever
+    comes first. This amortizes one HTTP request over many rows and
+    avoids creating a MergeTree part per evaluation.
+    """
+
+    def __init__(
+        self,
+        flush_callback: Callable,
+        max_rows: int = 5000,
+        max_age_ms: int = 2000,
+        max_queue: int = 50_000
+    ):
+        """
+        Initialize write buffer.
+
+        Args:
+            flush_callback: Async callable invoked with the list of buffered rows
+            max_rows: Flush when this many rows are pending
+            max_age_ms: Flush when the oldest pending row is this old (milliseconds)
+            max_queue: Maximum rows held in the buffer; put() blocks beyond this
+        """
+        self._flush_callback = flush_callback
+        self.max_rows = max_rows
+        self.max_age_ms = max_age_ms
+        # Bounded so a stalled ClickHouse applies backpressure to callers
+        # instead of growing the buffer until the worker OOMs
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self._task: Optional[asyncio.Task] = None
+        self._closed = False
+
+    async def put(self, row):
+        """
+        Add a rendered row to the buffer (starts the flusher on first use).
+
+        Blocks when max_queue rows are already pending, so a slow or down
+        ClickHouse backpressures callers rather than buffering unboundedly.
+        """
+        if self._task is None and not self._closed:
+            # Started lazily so the client can be constructed outside a running loop
+            self._task = asyncio.create_task(self._run())
+        await self._queue.put(row)
+
+    def pending(self) -> int:
+        """Number of rows waiting to be flushed."""
+        return self._queue.qsize()
+
+    async def _run(self):
+        """Collect rows until max_rows or max_age_ms is hit, then flush."""
+        loop = asyncio.get_running_loop()
+        draining = False
+        while not draining:
+            rows = []
+            first = await self._queue.get()
+            if first is _CLOSE_SENTINEL:
+                break
+            rows.append(first)
+            deadline = loop.time() + (self.max_age_ms / 1000.0)
+            while len(rows) < self.max_rows:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    row = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if row is _CLOSE_SENTINEL:
+                    draining = True
+                    break
+                rows.append(row)
+
+            try:
+                await self._flush_callback(rows)
+            except Exception as e:
+                logger.error("Write buffer flush failed: %s", e)
+
+    async def flush(self):
+        """Flush any rows currently in the buffer."""
+        rows = []
+        while not self._queue.empty():
+            row = self._queue.get_nowait()
+            if row is not _CLOSE_SENTINEL:
+                rows.append(row)
+        if rows:
+            await self._flush_callback(rows)
+
+    async def close(self):
+        """Stop the background flusher and drain pending rows.
+
+        Shutdown is cooperative: a sentinel row tells the flusher to
+        finish its in-flight batch and exit, so no rows already popped
+        from the queue can be lost to a cancellation mid-flush.
+        """
+        self._closed = True
+        if self._task is not None:
+            await self._queue.put(_CLOSE_SENTINEL)
+            await self._task
+        await self.flush()
+
 
 class ClickHouseClient:
     """Client for storing evaluation results in ClickHouse."""
-    
+
     def __init__(
         self,
         url: str,
         user: str,
         password: str,
-        database: str = "mnoc_prod"
+        database: str = "mnoc_prod",
+        max_rows: int = 5000,
+        max_age_ms: int = 2000,
+        max_queue: int = 50_000,
+        protocol: str = "http",
+        native_port: int = 9000,
+        insert_format: str = "values",
+        async_insert: bool = False
     ):
         """
         Initialize ClickHouse client.
-        
+
         Args:
             url: ClickHouse server URL (e.g., http://clickhouse:8123)
             user: Database user
             password: Database password
             database: Database name (default: mnoc_prod)
+            max_rows: Write buffer flush threshold (rows)
+            max_age_ms: Write buffer flush threshold (age of oldest row, ms)
+            max_queue: Buffered-row cap; store_evaluation blocks beyond it
+            protocol: "http" (port 8123) or "native" TCP (requires asynch)
+            native_port: ClickHouse native protocol port (default: 9000)
+            insert_format: "values" (escaped SQL text) or "rowbinary"
+            async_insert: Let ClickHouse coalesce small inserts server-side.
+                Inserts return before the data is durable, which is
+                acceptable for evaluation analytics.
         """
         self.url = url.rstrip("/")
         self.user = user
         self.password = password
         self.database = database
-        self.client = httpx.AsyncClient(timeout=30.0)
-        
-        logger.info(f"ClickHouseClient initialized with URL: {self.url}, User: {self.user}, Database: {self.database}")
-        logger.debug(f"ClickHouse password length: {len(self.password) if self.password else 0}")
-        
-    async def execute(self, query: str, params: Optional[Dict] = None) -> Dict:
+        self.protocol = protocol
+        self.native_port = native_port
+        self.insert_format = insert_format
+        self.async_insert = async_insert
+        self._pool = None
+        if protocol == "native" and asynch is None:
+            logger.warning("asynch not installed - falling back to HTTP protocol")
+            self.protocol = "http"
+        if self.protocol == "native" and insert_format == "rowbinary":
+            # The native path executes SQL text; RowBinary is HTTP-only
+            logger.warning("RowBinary inserts require the HTTP protocol - using values format")
+            self.insert_format = "values"
+        self._store_semaphore = asyncio.Semaphore(8)
+        # One persistent client: HTTP/2 multiplexes concurrent inserts over
+        # a single connection instead of paying TCP/TLS setup per request
+        self.client = httpx.AsyncClient(
+            http2=True,
+            timeout=30.0,
+            limits=httpx.Limits(
+                max_keepalive_connections=16,
+                max_connections=32,
+                keepalive_expiry=60
+            )
+        )
+        self._buffer = AsyncWriteBuffer(
+            flush_callback=self._flush_rows,
+            max_rows=max_rows,
+            max_age_ms=max_age_ms,
+            max_queue=max_queue
+        )
+
+        logger.info("ClickHouseClient initialized with URL: %s, User: %s, Database: %s", self.url, self.user, self.database)
+        logger.debug("ClickHouse password length: %d", len(self.password) if self.password else 0)
+
+    async def execute(self, query, params: Optional[Dict[str, Any]] = None) -> Dict:
         """
         Execute a ClickHouse query.
-        
+
         Args:
-            query: SQL query to execute
-            params: Query parameters (optional)
-            
+            query: SQL query to execute (str, pre-encoded bytes, or an
+                async iterable of bytes chunks that httpx streams as a
+                chunked request body). May contain `{name:Type}`
+                placeholders bound server-side from `params`, which
+                removes client-side escaping entirely.
+            params: Values for `{name:Type}` placeholders (optional)
+
         Returns:
             Query result
         """
+        if self.protocol == "native":
+            return await self._execute_native(query, params)
+
         try:
             url = urljoin(self.url, "/")
             request_params = {
@@ -55,173 +309,354 @@ class ClickHouseClient:
                 "password": self.password,
                 "database": self.database
             }
-            
-            logger.debug(f"ClickHouse request to {url}")
-            logger.debug(f"Request params - user: {request_params['user']}, database: {request_params['database']}, password_length: {len(request_params['password'])}")
-            
+            if params:
+                # ClickHouse binds {name:Type} placeholders from param_<name>
+                for key, value in params.items():
+                    request_params[f"param_{key}"] = str(value)
+            if self.async_insert:
+                # Server-side coalescing of small inserts into larger parts
+                request_params.update({
+                    "async_insert": "1",
+                    "wait_for_async_insert": "0",
+                    "async_insert_busy_timeout_ms": "1000",
+                    "async_insert_max_data_size": "10000000"
+                })
+
+            logger.debug("ClickHouse request to %s", url)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Request params - user: %s, database: %s, password_length: %d", request_params["user"], request_params["database"], len(request_params["password"]))
+
+            headers = None
+            if isinstance(query, (str, bytes)):
+                body = query if isinstance(query, bytes) else query.encode("utf-8")
+                if len(body) > _GZIP_THRESHOLD:
+                    # Large raw_response blobs compress well; trade CPU for bandwidth
+                    body = gzip.compress(body)
+                    headers = {"Content-Encoding": "gzip"}
+            else:
+                # Async iterables are sent chunk-encoded, so big flushes
+                # never hold a joined copy of the batch in memory
+                body = query
+
             response = await self.client.post(
                 url,
                 params=request_params,
-                data=query.encode("utf-8")
+                headers=headers,
+                content=body
             )
             response.raise_for_status()
             return {"success": True, "data": response.text}
         except httpx.HTTPError as e:
-            logger.error(f"ClickHouse query failed: {e}")
-            logger.error(f"Request URL: {url}, User: {self.user}, Database: {self.database}")
+            logger.error("ClickHouse query failed: %s", e)
+            logger.error("Request URL: %s, User: %s, Database: %s", url, self.user, self.database)
             if hasattr(e, 'response') and e.response is not None:
-                logger.error(f"Response status: {e.response.status_code}")
-                logger.error(f"Response body: {e.response.text}")
+                logger.error("Response status: %s", e.response.status_code)
+                logger.error("Response body: %s", e.response.text)
             return {"success": False, "error": str(e)}
-    
+
+    async def _execute_native(self, query, params: Optional[Dict[str, Any]] = None) -> Dict:
+        """
+        Execute a query over the native TCP protocol.
+
+        The native protocol is binary and avoids the text parsing overhead
+        of the HTTP interface, which matters most for bulk inserts.
+
+        Args:
+            query: SQL query to execute (str, or pre-encoded bytes)
+            params: Query arguments passed through to the driver (optional)
+
+        Returns:
+            Query result. Unlike the HTTP path, which returns the
+            server-formatted response text under "data", the native
+            driver returns typed rows, so "data" is a list of row tuples.
+        """
+        try:
+            if self._pool is None:
+                host = urlparse(self.url).hostname or "localhost"
+                self._pool = await asynch.create_pool(
+                    host=host,
+                    port=self.native_port,
+                    user=self.user,
+                    password=self.password,
+                    database=self.database
+                )
+
+            if isinstance(query, bytes):
+                query = query.decode("utf-8")
+            # FORMAT is an HTTP/CLI output directive; the native protocol
+            # always returns typed rows, so a clause written for the HTTP
+            # path must not reach the server
+            query = _FORMAT_CLAUSE_RE.sub("", query)
+            if params:
+                # {name:Type} binding only exists over HTTP; rewrite to
+                # pyformat so the driver substitutes the values itself
+                query = _to_pyformat(query)
+
+            async with self._pool.acquire() as conn:
+                async with conn.cursor() as cursor:
+                    await cursor.execute(query, params)
+                    data = cursor.fetchall()
+            return {"success": True, "data": data}
+        except Exception as e:
+            logger.error("ClickHouse native query failed: %s", e)
+            return {"success": False, "error": str(e)}
+
     async def store_evaluation(self, evaluation: Dict[str, Any], issue_data: Dict[str, Any]) -> bool:
         """
         Store evaluation results in ClickHouse.
-        
+
+        The row is rendered and pushed to the write buffer; the actual
+        INSERT happens in the background, batched with other pending rows.
+
         Args:
             evaluation: Evaluation results from agent
             issue_data: Original issue data
-            
+
         Returns:
-            True if stored successfully
+            True if the row was buffered for insert
         """
         try:
-            metrics = evaluation.get("metrics", {})
-            analysis = evaluation.get("analysis", {})
-            
-            # Calculate overall score (average of all metrics)
-            metric_values = [
-                metrics.get("solution_quality", 0),
-                metrics.get("adherence_to_solution", 0),
-                metrics.get("operator_effort", 0),
-                metrics.get("automation_potential", 0),
-                metrics.get("resolution_efficiency", 0)
-            ]
-            overall_score = sum(metric_values) / len(metric_values) if metric_values else 0
-            
-            # Determine flags
-            automation_candidate = 1 if metrics.get("automation_potential", 0) >= 7 else 0
-            requires_attention = 1 if any(v < 5 for v in metric_values) else 0
-            
-            # Calculate resolution time
-            resolution_time = 0
-            if issue_data.get("created_on") and issue_data.get("updated_on"):
-                try:
-                    created = datetime.fromisoformat(issue_data["created_on"].replace("Z", "+00:00"))
-                    closed = datetime.fromisoformat(issue_data["updated_on"].replace("Z", "+00:00"))
-                    resolution_time = int((closed - created).total_seconds())
-                except Exception as e:
-                    logger.warning(f"Could not calculate resolution time: {e}")
-            
-            # Format timestamps for ClickHouse
-            evaluated_at = evaluation.get("evaluated_at", datetime.utcnow().isoformat())
-            if isinstance(evaluated_at, str):
-                evaluated_at = datetime.fromisoformat(evaluated_at.replace("Z", "+00:00")).strftime("%Y-%m-%d %H:%M:%S")
-            
-            issue_created_at = issue_data.get("created_on", "")
-            if issue_created_at:
-                issue_created_at = datetime.fromisoformat(issue_created_at.replace("Z", "+00:00")).strftime("%Y-%m-%d %H:%M:%S")
+            # Encode early: all per-row formatting happens here on the
+            # caller's task; the flusher only joins pre-encoded chunks
+            if self.insert_format == "rowbinary":
+                rendered = self._encode_row_binary(evaluation, issue_data)
             else:
-                issue_created_at = "1970-01-01 00:00:00"
-                
-            issue_closed_at = issue_data.get("updated_on", "")
-            if issue_closed_at:
-                issue_closed_at = datetime.fromisoformat(issue_closed_at.replace("Z", "+00:00")).strftime("%Y-%m-%d %H:%M:%S")
+                rendered = self._render_values_tuple(evaluation, issue_data)
+
+            logger.info("Buffering evaluation for issue #%s for ClickHouse insert", issue_data.get("issue_id"))
+            logger.debug("Using ClickHouse: URL=%s, User=%s, Database=%s", self.url, self.user, self.database)
+
+            await self._buffer.put(rendered)
+            return True
+
+        except Exception as e:
+            logger.error("Error storing evaluation in ClickHouse: %s", e)
+            return False
+
+    async def store_many(self, items: List[Tuple[Dict[str, Any], Dict[str, Any]]]) -> List[bool]:
+        """
+        Store many evaluations concurrently.
+
+        Rendering runs in parallel tasks bounded by a semaphore, so batch
+        callers keep multiple writes outstanding instead of serializing
+        one store_evaluation await at a time.
+
+        Args:
+            items: List of (evaluation, issue_data) pairs
+
+        Returns:
+            Per-item buffered flags, in input order
+        """
+        async def _guarded(evaluation: Dict[str, Any], issue_data: Dict[str, Any]) -> bool:
+            async with self._store_semaphore:
+                return await self.store_evaluation(evaluation, issue_data)
+
+        return list(await asyncio.gather(*(_guarded(e, i) for e, i in items)))
+
+    def _row_values(self, evaluation: Dict[str, Any], issue_data: Dict[str, Any]) -> Tuple:
+        """
+        Compute the column values for one evaluation, in insert order.
+
+        Values are raw (unescaped) Python objects; the per-format
+        renderers handle quoting and encoding.
+
+        Args:
+            evaluation: Evaluation results from agent
+            issue_data: Original issue data
+
+        Returns:
+            Tuple of values matching the _INSERT_COLUMNS order
+        """
+        metrics = evaluation.get("metrics") or {}
+        analysis = evaluation.get("analysis") or {}
+
+        solution_quality = metrics.get("solution_quality", 0)
+        adherence = metrics.get("adherence_to_solution", 0)
+        operator_effort = metrics.get("operator_effort", 0)
+        automation_potential = metrics.get("automation_potential", 0)
+        efficiency = metrics.get("resolution_efficiency", 0)
+
+        # Overall score (average of all metrics) and flags, computed from
+        # locals - no intermediate list or generator per row
+        overall_score = (solution_quality + adherence + operator_effort
+                         + automation_potential + efficiency) * 0.2
+        automation_candidate = 1 if automation_potential >= 7 else 0
+        requires_attention = 1 if min(solution_quality, adherence, operator_effort,
+                                      automation_potential, efficiency) < 5 else 0
+
+        # Parse timestamps once; renderers format as needed
+        created_dt = _parse_timestamp(issue_data.get("created_on", ""))
+        closed_dt = _parse_timestamp(issue_data.get("updated_on", ""))
+
+        resolution_time = 0
+        if created_dt and closed_dt:
+            resolution_time = int((closed_dt - created_dt).total_seconds())
+
+        evaluated_raw = evaluation.get("evaluated_at")
+        evaluated_dt = _parse_timestamp(evaluated_raw) if isinstance(evaluated_raw, str) else None
+        if evaluated_dt is None:
+            evaluated_dt = datetime.now(timezone.utc)
+
+        return (
+            issue_data.get("issue_id", 0),
+            issue_data.get("project_id", 0),
+            issue_data.get("project_identifier", ""),
+            evaluated_dt,
+            created_dt or _EPOCH,
+            closed_dt or _EPOCH,
+            resolution_time,
+            (issue_data.get("subject") or "")[:500],
+            (issue_data.get("description") or "")[:2000],
+            issue_data.get("author", ""),
+            issue_data.get("tracker", ""),
+            issue_data.get("status", ""),
+            issue_data.get("priority", ""),
+            issue_data.get("issue_type", ""),
+            issue_data.get("class_id", ""),
+            evaluation.get("model", ""),
+            solution_quality,
+            adherence,
+            operator_effort,
+            automation_potential,
+            efficiency,
+            overall_score,
+            (analysis.get("solution_quality_notes") or "")[:1000],
+            (analysis.get("adherence_notes") or "")[:1000],
+            (analysis.get("operator_effort_notes") or "")[:1000],
+            (analysis.get("automation_recommendations") or "")[:2000],
+            (analysis.get("efficiency_notes") or "")[:1000],
+            (evaluation.get("summary") or "")[:2000],
+            evaluation.get("improvement_priority", "medium"),
+            automation_candidate,
+            requires_attention,
+            issue_data.get("issue_resolve_method", ""),
+            issue_data.get("issue_resolve_by", ""),
+            str(issue_data.get("alarming_state", "")),
+            str(evaluation.get("raw_response", ""))[:5000],
+        )
+
+    def _render_values_tuple(self, evaluation: Dict[str, Any], issue_data: Dict[str, Any]) -> bytes:
+        """
+        Render one evaluation as an escaped, UTF-8 encoded VALUES tuple.
+
+        Args:
+            evaluation: Evaluation results from agent
+            issue_data: Original issue data
+
+        Returns:
+            Encoded `(...)` fragment ready to be joined into a batch INSERT
+        """
+        parts = []
+        for kind, value in zip(_COLUMN_TYPES, self._row_values(evaluation, issue_data)):
+            if kind == "dt":
+                parts.append(f"'{value.strftime('%Y-%m-%d %H:%M:%S')}'")
+            elif kind in ("str", "enum8"):
+                parts.append(f"'{self._escape(value)}'")
             else:
-                issue_closed_at = "1970-01-01 00:00:00"
-            
-            # Prepare INSERT query
-            query = f"""
-            INSERT INTO ai_evaluations (
-                issue_id,
-                project_id,
-                project_identifier,
-                evaluated_at,
-                issue_created_at,
-                issue_closed_at,
-                resolution_time_seconds,
-                subject,
-                description,
-                author,
-                tracker,
-                status,
-                priority,
-                issue_type,
-                class_id,
-                evaluation_model,
-                solution_quality,
-                adherence_to_solution,
-                operator_effort,
-                automation_potential,
-                resolution_efficiency,
-                overall_score,
-                solution_quality_notes,
-                adherence_notes,
-                operator_effort_notes,
-                automation_recommendations,
-                efficiency_notes,
-                summary,
-                improvement_priority,
-                automation_candidate,
-                requires_attention,
-                resolve_method,
-                resolve_by,
-                alarming_state,
-                raw_response
-            ) VALUES (
-                {issue_data.get('issue_id', 0)},
-                {issue_data.get('project_id', 0)},
-                '{self._escape(issue_data.get('project_identifier', ''))}',
-                '{evaluated_at}',
-                '{issue_created_at}',
-                '{issue_closed_at}',
-                {resolution_time},
-                '{self._escape(issue_data.get('subject', '')[:500])}',
-                '{self._escape(issue_data.get('description', '')[:2000])}',
-                '{self._escape(issue_data.get('author', ''))}',
-                '{self._escape(issue_data.get('tracker', ''))}',
-                '{self._escape(issue_data.get('status', ''))}',
-                '{self._escape(issue_data.get('priority', ''))}',
-                '{self._escape(issue_data.get('issue_type', ''))}',
-                '{self._escape(issue_data.get('class_id', ''))}',
-                '{self._escape(evaluation.get('model', ''))}',
-                {metrics.get('solution_quality', 0)},
-                {metrics.get('adherence_to_solution', 0)},
-                {metrics.get('operator_effort', 0)},
-                {metrics.get('automation_potential', 0)},
-                {metrics.get('resolution_efficiency', 0)},
-                {overall_score},
-                '{self._escape(analysis.get('solution_quality_notes', '')[:1000])}',
-                '{self._escape(analysis.get('adherence_notes', '')[:1000])}',
-                '{self._escape(analysis.get('operator_effort_notes', '')[:1000])}',
-                '{self._escape(analysis.get('automation_recommendations', '')[:2000])}',
-                '{self._escape(analysis.get('efficiency_notes', '')[:1000])}',
-                '{self._escape(evaluation.get('summary', '')[:2000])}',
-                '{self._escape(evaluation.get('improvement_priority', 'medium'))}',
-                {automation_candidate},
-                {requires_attention},
-                '{self._escape(issue_data.get('issue_resolve_method', ''))}',
-                '{self._escape(issue_data.get('issue_resolve_by', ''))}',
-                '{self._escape(str(issue_data.get('alarming_state', '')))}',
-                '{self._escape(str(evaluation.get('raw_response', ''))[:5000])}'
-            )
-            """
-            
-            logger.info(f"Attempting to store evaluation for issue #{issue_data.get('issue_id')} to ClickHouse")
-            logger.debug(f"Using ClickHouse: URL={self.url}, User={self.user}, Database={self.database}")
-            
-            result = await self.execute(query)
-            
-            if result.get("success"):
-                logger.info(f"Successfully stored evaluation for issue #{issue_data.get('issue_id')} in ClickHouse")
-                return True
+                parts.append(str(value))
+        return ("(" + ",".join(parts) + ")").encode("utf-8")
+
+    @staticmethod
+    def _write_varint(value: int) -> bytes:
+        """Encode an unsigned integer as a ClickHouse varint (LEB128)."""
+        out = bytearray()
+        while True:
+            byte = value & 0x7F
+            value >>= 7
+            if value:
+                out.append(byte | 0x80)
             else:
-                logger.error(f"Failed to store evaluation for issue #{issue_data.get('issue_id')}: {result.get('error')}")
-                return False
-                
-        except Exception as e:
-            logger.error(f"Error storing evaluation in ClickHouse: {e}")
+                out.append(byte)
+                return bytes(out)
+
+    def _encode_row_binary(self, evaluation: Dict[str, Any], issue_data: Dict[str, Any]) -> bytes:
+        """
+        Encode one evaluation in ClickHouse RowBinary format.
+
+        RowBinary skips SQL escaping entirely and spares the server its
+        Values parser: integers are packed little-endian, strings are
+        varint-length prefixed UTF-8, DateTimes are UInt32 epoch seconds.
+
+        Args:
+            evaluation: Evaluation results from agent
+            issue_data: Original issue data
+
+        Returns:
+            Encoded row bytes ready to be appended to a RowBinary INSERT body
+        """
+        out = bytearray()
+        for kind, value in zip(_COLUMN_TYPES, self._row_values(evaluation, issue_data)):
+            if kind == "str":
+                encoded = str(value).encode("utf-8") if value else b""
+                out += self._write_varint(len(encoded))
+                out += encoded
+            elif kind == "u32":
+                out += struct.pack("<I", max(0, int(value)))
+            elif kind == "u8":
+                out += struct.pack("<B", max(0, min(255, int(value))))
+            elif kind == "f32":
+                out += struct.pack("<f", float(value))
+            elif kind == "dt":
+                out += struct.pack("<I", max(0, int(value.timestamp())))
+            else:  # enum8
+                out += struct.pack("<b", _PRIORITY_ENUM.get(str(value), 2))
+        return bytes(out)
+
+    async def _iter_insert_body(self, rows: List[bytes]):
+        """
+        Yield the INSERT header followed by pre-encoded rows.
+
+        Peak memory for a flush stays at one row instead of the whole
+        joined batch, which matters when raw_response blobs run to
+        kilobytes across thousands of buffered rows.
+
+        Args:
+            rows: Rendered value tuples from the write buffer
+
+        Yields:
+            Bytes chunks forming the complete INSERT body
+        """
+        if self.insert_format == "rowbinary":
+            yield _INSERT_HEADER_ROWBINARY
+            for row in rows:
+                yield row
+        else:
+            yield _INSERT_HEADER
+            separator = b""
+            for row in rows:
+                yield separator + row
+                separator = b","
+
+    async def _flush_rows(self, rows: List[bytes]) -> bool:
+        """
+        Flush buffered rows as a single multi-row INSERT.
+
+        Args:
+            rows: Rendered value tuples from the write buffer
+
+        Returns:
+            True if the batch was inserted successfully
+        """
+        if self.protocol == "native":
+            # The native driver takes one SQL string; no streaming body
+            result = await self.execute(_INSERT_HEADER + b",".join(rows))
+        else:
+            result = await self.execute(self._iter_insert_body(rows))
+
+        if result.get("success"):
+            logger.info("Flushed %d evaluation(s) to ClickHouse", len(rows))
+            return True
+        else:
+            logger.error("Failed to flush %d evaluation(s) to ClickHouse: %s", len(rows), result.get("error"))
             return False
+
+    async def flush(self):
+        """Flush any buffered evaluations immediately."""
+        await self._buffer.flush()
+
+    def pending_writes(self) -> int:
+        """Rows buffered but not yet inserted (for health/stats reporting)."""
+        return self._buffer.pending()
     
     def _escape(self, value: str) -> str:
         """
@@ -235,8 +670,8 @@ class ClickHouseClient:
         """
         if not value:
             return ""
-        # Escape single quotes and backslashes
-        return str(value).replace("\\", "\\\\").replace("'", "\\'")
+        # Escape single quotes and backslashes in one pass
+        return str(value).translate(_ESCAPE_TABLE)
     
     async def get_automation_candidates(self, limit: int = 20) -> Dict:
         """
@@ -248,8 +683,8 @@ class ClickHouseClient:
         Returns:
             Query results
         """
-        query = f"""
-        SELECT 
+        query = """
+        SELECT
             issue_id,
             project_identifier,
             subject,
@@ -259,10 +694,10 @@ class ClickHouseClient:
         FROM ai_evaluations
         WHERE automation_potential >= 8
         ORDER BY automation_potential DESC, evaluated_at DESC
-        LIMIT {limit}
+        LIMIT {limit:UInt32}
         FORMAT JSONCompact
         """
-        return await self.execute(query)
+        return await self.execute(query, {"limit": limit})
     
     async def get_quality_trends(self, project: Optional[str] = None, days: int = 30) -> Dict:
         """
@@ -275,24 +710,32 @@ class ClickHouseClient:
         Returns:
             Query results
         """
-        where_clause = f"AND project_identifier = '{self._escape(project)}'" if project else ""
-        
+        params = {"days": days}
+        where_clause = ""
+        if project:
+            where_clause = "AND project_identifier = {project:String}"
+            params["project"] = project
+
         query = f"""
-        SELECT 
+        SELECT
             toStartOfWeek(evaluated_at) AS week,
             project_identifier,
             avg(solution_quality) AS avg_quality,
             avg(automation_potential) AS avg_automation,
             count() AS total_issues
         FROM ai_evaluations
-        WHERE evaluated_at >= now() - INTERVAL {days} DAY
+        WHERE evaluated_at >= now() - INTERVAL {{days:UInt32}} DAY
         {where_clause}
         GROUP BY week, project_identifier
         ORDER BY week DESC, project_identifier
         FORMAT JSONCompact
         """
-        return await self.execute(query)
+        return await self.execute(query, params)
     
     async def close(self):
-        """Close HTTP client."""
+        """Drain the write buffer and close connections."""
+        await self._buffer.close()
+        if self._pool is not None:
+            self._pool.close()
+            await self._pool.wait_closed()
         await self.client.aclose()
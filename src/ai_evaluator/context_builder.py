@@ -1,11 +1,34 @@
 """Shared context builder to avoid code duplication."""
 
-from typing import Optional
+import asyncio
+import time
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
 from datetime import datetime, timedelta
 import logging
 
 logger = logging.getLogger(__name__)
 
+# How long a fetched issue stays fresh; covers the common case where
+# resolution notes and AI analysis are extracted from the same issue
+_ISSUE_CACHE_TTL = 60.0
+
+# Knowledge and Zabbix context changes slowly; retries and batch replays
+# of the same issue within this window skip the MCP round-trip
+_CONTEXT_CACHE_TTL = 300.0
+
+# Caches are bounded: evicting the oldest entry (insertion order) and
+# its lock keeps a long-running service from accumulating one entry per
+# issue, class and correlation window it has ever seen
+_CACHE_MAX = 1024
+
+
+def _evict_oldest(cache: Dict, locks: Dict) -> None:
+    """Drop the oldest cache entry and its lock to stay under _CACHE_MAX."""
+    oldest = next(iter(cache))
+    del cache[oldest]
+    locks.pop(oldest, None)
+
 
 class ContextBuilder:
     """
@@ -23,6 +46,62 @@ class ContextBuilder:
             mcp_client: MCP client instance (from ai-agents or ai-evaluator)
         """
         self.mcp = mcp_client
+        self._issue_cache: Dict[int, Tuple[float, dict]] = {}
+        self._issue_locks: Dict[int, asyncio.Lock] = defaultdict(asyncio.Lock)
+        self._fetch_cache: Dict[tuple, Tuple[float, Any]] = {}
+        self._fetch_locks: Dict[tuple, asyncio.Lock] = defaultdict(asyncio.Lock)
+
+    async def _cached_fetch(self, key: tuple, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run an MCP fetch at most once per TTL window for a given key.
+
+        The per-key lock coalesces concurrent identical fetches into one
+        round-trip (stampede protection during batch replays). Failures
+        are not cached, so the next caller retries.
+
+        Args:
+            key: Hashable cache key identifying the fetch arguments
+            fetch: Zero-argument coroutine factory performing the fetch
+
+        Returns:
+            The fetched (or cached) result
+        """
+        async with self._fetch_locks[key]:
+            cached = self._fetch_cache.get(key)
+            now = time.monotonic()
+            if cached and now - cached[0] < _CONTEXT_CACHE_TTL:
+                return cached[1]
+
+            result = await fetch()
+            if len(self._fetch_cache) >= _CACHE_MAX:
+                _evict_oldest(self._fetch_cache, self._fetch_locks)
+            self._fetch_cache[key] = (now, result)
+            return result
+
+    async def _cached_issue(self, issue_id: int) -> dict:
+        """
+        Fetch issue details at most once per TTL window.
+
+        A per-issue lock coalesces concurrent fetches for the same issue
+        into a single MCP round-trip (single-flight).
+
+        Args:
+            issue_id: Redmine issue ID
+
+        Returns:
+            Full issue details including journals
+        """
+        async with self._issue_locks[issue_id]:
+            cached = self._issue_cache.get(issue_id)
+            now = time.monotonic()
+            if cached and now - cached[0] < _ISSUE_CACHE_TTL:
+                return cached[1]
+
+            issue_detail = await self.mcp.get_redmine_issue(issue_id)
+            if len(self._issue_cache) >= _CACHE_MAX:
+                _evict_oldest(self._issue_cache, self._issue_locks)
+            self._issue_cache[issue_id] = (now, issue_detail)
+            return issue_detail
     
     async def build_issue_context(
         self,
@@ -49,20 +128,26 @@ class ContextBuilder:
             "zabbix": None,
             "errors": []
         }
-        
-        # Fetch knowledge base data
+
+        # The fetches are independent; run them concurrently so wall-clock
+        # time is max(t_knowledge, t_zabbix) instead of the sum
+        fetches = []
+
         if include_knowledge and issue_data.get("class_id"):
-            try:
-                knowledge = await self.mcp.get_knowledge(
-                    class_id=issue_data["class_id"],
-                    project_identifier=issue_data["project_identifier"]
+            class_id = issue_data["class_id"]
+            project = issue_data["project_identifier"]
+            fetches.append((
+                "knowledge",
+                "Knowledge fetch failed",
+                self._cached_fetch(
+                    ("knowledge", class_id, project),
+                    lambda: self.mcp.get_knowledge(
+                        class_id=class_id,
+                        project_identifier=project
+                    )
                 )
-                context["knowledge"] = knowledge
-            except Exception as e:
-                logger.error(f"Failed to fetch knowledge: {e}")
-                context["errors"].append(f"Knowledge fetch failed: {e}")
-        
-        # Fetch Zabbix correlation data
+            ))
+
         if include_zabbix and issue_data.get("created_on"):
             try:
                 created_time = datetime.fromisoformat(
@@ -70,16 +155,36 @@ class ContextBuilder:
                 )
                 time_from = created_time - timedelta(minutes=correlation_minutes)
                 time_to = created_time + timedelta(minutes=correlation_minutes)
-                
-                zabbix = await self.mcp.search_zabbix_alerts(
-                    time_from=time_from.isoformat(),
-                    time_to=time_to.isoformat()
-                )
-                context["zabbix"] = zabbix
+
+                from_iso = time_from.isoformat()
+                to_iso = time_to.isoformat()
+                fetches.append((
+                    "zabbix",
+                    "Zabbix fetch failed",
+                    self._cached_fetch(
+                        ("zabbix", from_iso, to_iso),
+                        lambda: self.mcp.search_zabbix_alerts(
+                            time_from=from_iso,
+                            time_to=to_iso
+                        )
+                    )
+                ))
             except Exception as e:
                 logger.error(f"Failed to fetch Zabbix data: {e}")
                 context["errors"].append(f"Zabbix fetch failed: {e}")
-        
+
+        if fetches:
+            results = await asyncio.gather(
+                *(coro for _, _, coro in fetches),
+                return_exceptions=True
+            )
+            for (key, error_prefix, _), result in zip(fetches, results):
+                if isinstance(result, Exception):
+                    logger.error(f"Failed to fetch {key}: {result}")
+                    context["errors"].append(f"{error_prefix}: {result}")
+                else:
+                    context[key] = result
+
         return context
     
     async def get_resolution_notes(self, issue_id: int) -> str:
@@ -93,8 +198,8 @@ class ContextBuilder:
             Concatenated resolution notes from all journals
         """
         try:
-            issue_detail = await self.mcp.get_redmine_issue(issue_id)
-            
+            issue_detail = await self._cached_issue(issue_id)
+
             journals = issue_detail.get("journals", [])
             notes = []
             
@@ -124,7 +229,7 @@ class ContextBuilder:
             AI analysis text or None
         """
         try:
-            issue_detail = await self.mcp.get_redmine_issue(issue_id)
+            issue_detail = await self._cached_issue(issue_id)
             journals = issue_detail.get("journals", [])
             
             # Look for AI analysis (usually first note from ai-agents)
@@ -3,13 +3,15 @@
 import os
 import asyncio
 import logging
-from datetime import datetime
+from datetime import datetime, timezone
 from contextlib import asynccontextmanager
 from asyncio import Queue
 from dotenv import load_dotenv
 from fastapi import FastAPI, HTTPException, Depends, status
+from fastapi.responses import ORJSONResponse
 from fastapi.security import HTTPBasic, HTTPBasicCredentials
 from pydantic import BaseModel
+import random
 import secrets
 
 from .evaluator import EvaluationAgent
@@ -60,6 +62,10 @@ clickhouse_client: ClickHouseClient = None
 evaluation_queue: Queue = None
 queue_worker_task = None
 
+# Strong references to fire-and-forget evaluation tasks; tasks discard
+# themselves when done so the set only holds in-flight work
+background_evaluations: set = set()
+
 
 class EvaluationQueue:
     """Queue for managing concurrent evaluation requests."""
@@ -103,7 +109,7 @@ class EvaluationQueue:
                     error_result = {
                         "issue_id": issue_data.get("issue_id"),
                         "error": str(e),
-                        "evaluated_at": datetime.utcnow().isoformat()
+                        "evaluated_at": datetime.now(timezone.utc).isoformat()
                     }
                     future.set_result(error_result)
                 finally:
@@ -128,8 +134,10 @@ class EvaluationQueue:
                 # Only retry on transient errors (network, timeout, stream errors)
                 if any(x in error_msg for x in ['timeout', 'connection', 'protocol', 'prematurely', 'network']):
                     if attempt < max_retries - 1:
-                        wait_time = 2 ** attempt  # Exponential backoff: 1s, 2s, 4s
-                        logger.warning(f"Transient error on attempt {attempt + 1}/{max_retries}, retrying in {wait_time}s: {e}")
+                        # Exponential backoff (~1s, 2s, 4s) with jitter so
+                        # queued retries don't synchronize against Bedrock
+                        wait_time = 2 ** attempt * (0.5 + random.random())
+                        logger.warning(f"Transient error on attempt {attempt + 1}/{max_retries}, retrying in {wait_time:.1f}s: {e}")
                         await asyncio.sleep(wait_time)
                         continue
                 
@@ -186,6 +194,25 @@ class EvaluationResponse(BaseModel):
     evaluation: dict | None = None
 
 
+class BatchEvaluationRequest(BaseModel):
+    """Request to evaluate several issues in one call."""
+    issues: list[EvaluationRequest]
+    max_concurrency: int = 8
+    # Share one rubric across several issues per LLM call instead of
+    # fanning out one call per issue (cheaper, but a malformed batch
+    # response degrades every issue in its chunk)
+    batch_prompt: bool = False
+
+
+class BatchEvaluationResponse(BaseModel):
+    """Response from a batch evaluation."""
+    success: bool
+    total: int
+    succeeded: int
+    failed: int
+    results: list[dict]
+
+
 def verify_credentials(credentials: HTTPBasicCredentials = Depends(security)):
     """Verify HTTP basic auth credentials."""
     correct_username = secrets.compare_digest(credentials.username, SERVICE_USERNAME)
@@ -217,8 +244,8 @@ async def lifespan(app: FastAPI):
         api_key=MCP_API_KEY
     )
     
-    # Start the MCP client session (critical!)
-    mcp_client.start()
+    # Open the persistent MCP session (critical!)
+    await mcp_client.connect()
     logger.info("MCP client session started")
     
     # Get MCP tools for the agent
@@ -269,7 +296,7 @@ async def lifespan(app: FastAPI):
         await evaluation_queue.stop()
     
     if mcp_client:
-        mcp_client.close()
+        await mcp_client.close()
         logger.info("MCP client closed")
     
     if clickhouse_client:
@@ -281,7 +308,10 @@ app = FastAPI(
     title="MNOC AI Evaluator",
     description="Post-resolution quality assessment service",
     version="0.1.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    # Evaluation dicts and ClickHouse rows are JSON-heavy; orjson encodes
+    # them severalfold faster than stdlib json and writes bytes directly
+    default_response_class=ORJSONResponse
 )
 
 
@@ -311,7 +341,7 @@ async def evaluate_issue(
     
     try:
         # Convert request to dict for evaluator (Pydantic v2)
-        issue_data = request.model_dump()
+        issue_data = request.model_dump(mode="python", exclude_none=True)
         
         # Queue evaluation (handles concurrency and retries)
         logger.info(f"Queueing evaluation for issue #{request.issue_id} (queue size: {evaluation_queue.queue_size()})")
@@ -352,6 +382,114 @@ async def evaluate_issue(
         )
 
 
+async def _evaluate_and_store(issue_data: dict):
+    """Run a deferred evaluation and store the result in ClickHouse."""
+    issue_id = issue_data.get("issue_id")
+    try:
+        evaluation = await evaluation_queue.enqueue(issue_data)
+        if CLICKHOUSE_ENABLED and clickhouse_client and not evaluation.get("error"):
+            await clickhouse_client.store_evaluation(evaluation, issue_data)
+        logger.info(f"Deferred evaluation completed for issue #{issue_id}")
+    except Exception as e:
+        logger.error(f"Deferred evaluation failed for issue #{issue_id}: {e}")
+
+
+@app.post("/evaluate/async", status_code=status.HTTP_202_ACCEPTED)
+async def evaluate_issue_async(
+    request: EvaluationRequest,
+    username: str = Depends(verify_credentials)
+):
+    """
+    Enqueue an evaluation without waiting for the result.
+
+    Evaluations are post-resolution and tolerate minutes of latency, so
+    callers that don't need the result inline (periodic catch-up jobs,
+    event-source hooks) can return immediately; the evaluation runs in
+    the background and lands in ClickHouse.
+    """
+    logger.info(f"Received deferred evaluation request for issue #{request.issue_id} from {username}")
+
+    issue_data = request.model_dump(mode="python", exclude_none=True)
+    task = asyncio.create_task(_evaluate_and_store(issue_data))
+    background_evaluations.add(task)
+    task.add_done_callback(background_evaluations.discard)
+
+    return {
+        "accepted": True,
+        "issue_id": request.issue_id,
+        "queue_size": evaluation_queue.queue_size()
+    }
+
+
+@app.post("/evaluate/batch", response_model=BatchEvaluationResponse)
+async def evaluate_batch(
+    request: BatchEvaluationRequest,
+    username: str = Depends(verify_credentials)
+):
+    """
+    Evaluate several closed issues concurrently.
+
+    Used for backlog replay and analytics catch-up, where serial POSTs
+    to /evaluate would take N times the LLM round-trip. By default
+    evaluations run in parallel bounded by max_concurrency; with
+    batch_prompt=true they are grouped so several issues share one LLM
+    call (and its rubric tokens). Results are stored in ClickHouse as
+    one batched insert either way.
+    """
+    logger.info(f"Received batch evaluation request for {len(request.issues)} issues from {username}")
+
+    issue_datas = [issue.model_dump(mode="python", exclude_none=True) for issue in request.issues]
+
+    if request.batch_prompt:
+        try:
+            results = await evaluation_agent.evaluate_batch(issue_datas)
+        except Exception as e:
+            logger.error(f"Batch-prompt evaluation failed: {e}")
+            evaluated_at = datetime.now(timezone.utc).isoformat()
+            results = [
+                {"issue_id": issue_data["issue_id"], "error": str(e), "evaluated_at": evaluated_at}
+                for issue_data in issue_datas
+            ]
+    else:
+        semaphore = asyncio.Semaphore(request.max_concurrency)
+
+        async def _evaluate_one(issue_data: dict) -> dict:
+            async with semaphore:
+                return await evaluation_agent.evaluate_resolution(issue_data)
+
+        results = await asyncio.gather(
+            *(_evaluate_one(issue_data) for issue_data in issue_datas),
+            return_exceptions=True
+        )
+
+    responses = []
+    to_store = []
+    for issue_data, result in zip(issue_datas, results):
+        if isinstance(result, Exception):
+            logger.error(f"Batch evaluation failed for issue #{issue_data['issue_id']}: {result}")
+            responses.append({
+                "issue_id": issue_data["issue_id"],
+                "error": str(result),
+                "evaluated_at": datetime.now(timezone.utc).isoformat()
+            })
+        else:
+            responses.append(result)
+            if not result.get("error"):
+                to_store.append((result, issue_data))
+
+    if CLICKHOUSE_ENABLED and clickhouse_client and to_store:
+        await clickhouse_client.store_many(to_store)
+
+    failed = sum(1 for r in responses if r.get("error"))
+    return BatchEvaluationResponse(
+        success=failed == 0,
+        total=len(responses),
+        succeeded=len(responses) - failed,
+        failed=failed,
+        results=responses
+    )
+
+
 @app.get("/stats")
 async def get_stats(username: str = Depends(verify_credentials)):
     """Get evaluation statistics."""
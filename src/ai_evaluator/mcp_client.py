@@ -1,13 +1,46 @@
 """MCP Client for AI Evaluator - reuses MCP server tools."""
 
+import asyncio
 import httpx
+import json
 import logging
+import orjson
+import random
+import time
+import uuid
+from collections import defaultdict
+from functools import partial
 from typing import Any, Optional
 from mcp.client.streamable_http import streamablehttp_client
 from strands.tools.mcp.mcp_client import MCPClient as StrandsMCPClient
 
 logger = logging.getLogger(__name__)
 
+# Retry policy for transient tool-call failures (5xx, 429, timeouts)
+_RETRY_ATTEMPTS = 3
+_RETRY_BASE_DELAY = 0.5
+_RETRY_MAX_DELAY = 8.0
+
+# Knowledge data changes slowly (it aggregates historical issues), so a
+# short TTL cache removes the repeated MCP round-trip when many issues
+# of the same class are evaluated close together
+_KNOWLEDGE_CACHE_TTL = 300.0
+_KNOWLEDGE_CACHE_MAX = 512
+
+# Longest a tool's circuit stays open after consecutive failures
+_CIRCUIT_MAX_OPEN = 60.0
+
+
+def _make_transport(base_url: str, api_key: str):
+    """Transport factory for the Strands client (bound with partial)."""
+    if api_key:
+        headers = {"Authorization": f"Bearer {api_key}"}
+        logger.info("[mcp] MCP authentication enabled (using Authorization Bearer header)")
+        return streamablehttp_client(base_url, headers=headers)
+    else:
+        logger.warning("[mcp] MCP authentication disabled - no API key provided")
+        return streamablehttp_client(base_url)
+
 
 class MCPClient:
     """Client for communicating with Redmine MCP Server."""
@@ -23,62 +56,244 @@ class MCPClient:
         self.base_url = base_url.rstrip("/")
         self.api_key = api_key
         
-        # Create transport factory function (like ai-agents does)
-        def create_transport():
-            if api_key:
-                headers = {"Authorization": f"Bearer {api_key}"}
-                logger.info("[mcp] MCP authentication enabled (using Authorization Bearer header)")
-                return streamablehttp_client(base_url, headers=headers)
-            else:
-                logger.warning("[mcp] MCP authentication disabled - no API key provided")
-                return streamablehttp_client(base_url)
-        
-        # Create Strands MCP client
-        self._client = StrandsMCPClient(create_transport)
-        
+        # Create Strands MCP client; the transport factory is the
+        # module-level _make_transport bound to this instance's settings
+        self._client = StrandsMCPClient(partial(_make_transport, base_url, api_key))
+        self._started = False
+
+        # (class_id, project) -> (fetched_at, result); per-key locks give
+        # single-flight so concurrent misses trigger one fetch
+        self._knowledge_cache: dict[tuple[str, str], tuple[float, dict]] = {}
+        self._knowledge_locks: dict[tuple[str, str], asyncio.Lock] = defaultdict(asyncio.Lock)
+        self.knowledge_cache_hits = 0
+        self.knowledge_cache_misses = 0
+
+        # Tool schemas are static for the lifetime of a session; fetched
+        # once and reused by every list_tools_sync caller
+        self._tools_cache: Optional[list] = None
+
+        # Circuit breaker: a tool failing repeatedly is skipped outright
+        # for a growing window instead of burning retries on every call
+        self._failures: dict[str, int] = defaultdict(int)
+        self._circuit_open_until: dict[str, float] = {}
+
+        # Persistent pooled client for direct tool calls: HTTP/2
+        # multiplexes the parallel context fetches over one connection
+        # and gzip shrinks large Zabbix/knowledge payloads on the wire
+        headers = {"accept-encoding": "gzip, br"}
+        if api_key:
+            headers["Authorization"] = f"Bearer {api_key}"
+        self.client = httpx.AsyncClient(
+            # Trailing slash so relative paths resolve under the MCP prefix
+            base_url=self.base_url + "/",
+            http2=True,
+            headers=headers,
+            limits=httpx.Limits(
+                max_keepalive_connections=32,
+                max_connections=64,
+                keepalive_expiry=60.0
+            ),
+            timeout=httpx.Timeout(30.0, connect=5.0)
+        )
+
     def start(self):
         """Start the MCP client session."""
         self._client.start()
-        
-    def close(self):
-        """Close the MCP client session."""
-        try:
-            self._client.close()
-        except:
-            pass
-    
+        self._started = True
+        # A fresh session may advertise a different tool set
+        self._tools_cache = None
+
+    async def connect(self):
+        """
+        Open the persistent MCP session without blocking the loop.
+
+        The session handshake (initialize + capability exchange) is paid
+        once here instead of per tool call; async so it slots into the
+        FastAPI lifespan.
+        """
+        await asyncio.to_thread(self.start)
+
     def list_tools_sync(self) -> list:
-        """List available MCP tools synchronously."""
-        return self._client.list_tools_sync()
+        """List available MCP tools synchronously (cached per session)."""
+        if self._tools_cache is None:
+            self._tools_cache = self._client.list_tools_sync()
+        return self._tools_cache
         
     async def call_tool(self, tool_name: str, arguments: dict) -> dict:
         """
         Call an MCP tool.
-        
+
+        Prefers the persistent MCP session (one handshake at startup,
+        reused for every call); if the session is down or the call
+        fails, falls back to the direct HTTP path, where transient
+        failures (timeouts, connection errors, 429 and 5xx responses)
+        are retried with capped exponential backoff plus jitter.
+
         Args:
             tool_name: Name of the tool to call
             arguments: Tool arguments
-            
+
         Returns:
             Tool response data
         """
-        try:
-            response = await self.client.post(
-                f"{self.base_url}/tools/{tool_name}",
-                json={"arguments": arguments}
-            )
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPError as e:
-            logger.error(f"MCP tool call failed: {tool_name} - {e}")
-            return {"error": str(e)}
+        if time.monotonic() < self._circuit_open_until.get(tool_name, 0.0):
+            logger.warning(f"MCP tool {tool_name} circuit open, skipping call")
+            return {"error": "circuit-open"}
+
+        if self._started:
+            try:
+                result = await self._client.call_tool_async(
+                    tool_use_id=f"{tool_name}-{uuid.uuid4().hex[:8]}",
+                    name=tool_name,
+                    arguments=arguments
+                )
+                self._record_success(tool_name)
+                return self._tool_result_to_dict(result)
+            except Exception as e:
+                logger.warning(f"MCP session call failed for {tool_name}, trying HTTP: {e}")
+
+        last_error = None
+        for attempt in range(_RETRY_ATTEMPTS):
+            try:
+                # orjson on both sides skips httpx's stdlib-json paths;
+                # knowledge/Zabbix payloads can run to hundreds of KB
+                response = await self.client.post(
+                    f"tools/{tool_name}",
+                    content=orjson.dumps({"arguments": arguments}),
+                    headers={"content-type": "application/json"}
+                )
+                response.raise_for_status()
+                self._record_success(tool_name)
+                return orjson.loads(response.content)
+            except httpx.HTTPStatusError as e:
+                status_code = e.response.status_code
+                if status_code != 429 and status_code < 500:
+                    # Client errors won't succeed on retry
+                    logger.error(f"MCP tool call failed: {tool_name} - {e}")
+                    self._record_failure(tool_name)
+                    return {"error": str(e)}
+                last_error = e
+            except httpx.HTTPError as e:
+                last_error = e
+
+            if attempt < _RETRY_ATTEMPTS - 1:
+                # Jitter spreads concurrent retries so they don't re-stampede
+                delay = min(_RETRY_MAX_DELAY, _RETRY_BASE_DELAY * 2 ** attempt)
+                delay *= 0.5 + random.random()
+                logger.warning(
+                    f"MCP tool call {tool_name} failed (attempt {attempt + 1}/{_RETRY_ATTEMPTS}), "
+                    f"retrying in {delay:.1f}s: {last_error}"
+                )
+                await asyncio.sleep(delay)
+
+        logger.error(f"MCP tool call failed: {tool_name} - {last_error}")
+        self._record_failure(tool_name)
+        return {"error": str(last_error)}
+
+    def _record_success(self, tool_name: str):
+        """Close the tool's circuit after a successful call."""
+        self._failures.pop(tool_name, None)
+        self._circuit_open_until.pop(tool_name, None)
+
+    def _record_failure(self, tool_name: str):
+        """Count a failed call and open the circuit with growing backoff."""
+        self._failures[tool_name] += 1
+        open_for = min(_CIRCUIT_MAX_OPEN, 2.0 ** self._failures[tool_name])
+        self._circuit_open_until[tool_name] = time.monotonic() + open_for
+        logger.warning(
+            f"MCP tool {tool_name} failed {self._failures[tool_name]} time(s) "
+            f"in a row, circuit open for {open_for:.0f}s"
+        )
+
+    @staticmethod
+    def _tool_result_to_dict(result) -> dict:
+        """
+        Convert an MCP tool result into the dict shape call_tool returns.
+
+        Tool results carry a list of content blocks; the text blocks are
+        joined and, when they hold a JSON object, parsed into it.
+
+        Args:
+            result: Tool result from the MCP session
+
+        Returns:
+            Parsed payload dict, {"content": text} for non-JSON text,
+            or {"error": ...} for error-status results
+        """
+        content = result.get("content") if isinstance(result, dict) else None
+        texts = [
+            block["text"]
+            for block in content or []
+            if isinstance(block, dict) and block.get("text")
+        ]
+        text = "\n".join(texts)
+
+        if isinstance(result, dict) and result.get("status") == "error":
+            return {"error": text or "tool call failed"}
+
+        if text:
+            try:
+                parsed = json.loads(text)
+                if isinstance(parsed, dict):
+                    return parsed
+            except json.JSONDecodeError:
+                pass
+        return {"content": text}
     
+    async def batch_call(self, calls: list[tuple[str, dict]]) -> list[dict]:
+        """
+        Dispatch several independent tool calls concurrently.
+
+        The calls share the pooled HTTP/2 connection, so N round-trips
+        cost roughly one RTT instead of N when issued together.
+
+        Args:
+            calls: (tool_name, arguments) pairs
+
+        Returns:
+            Per-call response dicts in input order; a failed call yields
+            an {"error": ...} dict like call_tool does
+        """
+        results = await asyncio.gather(
+            *(self.call_tool(name, arguments) for name, arguments in calls),
+            return_exceptions=True
+        )
+        return [
+            {"error": str(result)} if isinstance(result, Exception) else result
+            for result in results
+        ]
+
     async def get_knowledge(self, class_id: str, project_identifier: str) -> dict:
-        """Fetch knowledge base data for a class_id."""
-        return await self.call_tool("get_knowledge", {
-            "class_id": class_id,
-            "project_identifier": project_identifier
-        })
+        """
+        Fetch knowledge base data for a class_id.
+
+        Results are cached in-process for _KNOWLEDGE_CACHE_TTL seconds,
+        keyed by (class_id, project_identifier); error responses are not
+        cached. Hit/miss counts are kept on knowledge_cache_hits /
+        knowledge_cache_misses for observability.
+        """
+        key = (class_id, project_identifier)
+        async with self._knowledge_locks[key]:
+            now = time.monotonic()
+            cached = self._knowledge_cache.get(key)
+            if cached is not None and now - cached[0] < _KNOWLEDGE_CACHE_TTL:
+                self.knowledge_cache_hits += 1
+                return cached[1]
+            self.knowledge_cache_misses += 1
+
+            result = await self.call_tool("get_knowledge", {
+                "class_id": class_id,
+                "project_identifier": project_identifier
+            })
+            if "error" not in result:
+                if len(self._knowledge_cache) >= _KNOWLEDGE_CACHE_MAX:
+                    # Drop the oldest entry (insertion order) and its lock
+                    # so neither map grows past the cap
+                    oldest = next(iter(self._knowledge_cache))
+                    del self._knowledge_cache[oldest]
+                    self._knowledge_locks.pop(oldest, None)
+                self._knowledge_cache[key] = (now, result)
+            return result
     
     async def search_zabbix_alerts(
         self,
@@ -123,5 +338,10 @@ class MCPClient:
         return await self.call_tool("update_redmine_issue", args)
     
     async def close(self):
-        """Close HTTP client."""
+        """Close the MCP session and the pooled HTTP client."""
+        self._started = False
+        try:
+            self._client.close()
+        except Exception:
+            pass
         await self.client.aclose()
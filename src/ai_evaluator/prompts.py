@@ -1,64 +1,29 @@
 """AI Evaluator - Evaluation prompts for post-resolution analysis."""
 
-def get_evaluation_prompt(
-    issue_data: dict,
-    ai_analysis: str,
-    resolution_notes: str,
-    knowledge_data: dict,
-    zabbix_data: dict,
-) -> str:
-    """
-    Generate evaluation prompt for assessing resolution quality.
-    
-    This prompt is designed for a different AI model (Claude Opus) to provide
-    unbiased evaluation of how the issue was resolved.
-    """
-    
-    issue_id = issue_data.get("issue_id")
-    project = issue_data.get("project_identifier")
-    subject = issue_data.get("subject")
-    issue_type = issue_data.get("issue_type", "unknown")
-    class_id = issue_data.get("class_id", "")
-    
-    resolve_method = issue_data.get("issue_resolve_method", "unknown")
-    resolve_in = issue_data.get("issue_resolve_in", "unknown")
-    resolve_by = issue_data.get("issue_resolve_by", "unknown")
-    
-    prompt = f"""# Resolution Quality Evaluation
-
-You are an expert technical evaluator assessing the quality of issue resolution in a network monitoring system.
-
-## Issue Details
-- **Issue ID**: #{issue_id}
-- **Project**: {project}
-- **Subject**: {subject}
-- **Issue Type**: {issue_type}
-- **Class ID**: {class_id or 'Not classified'}
-- **Resolution Method**: {resolve_method}
-- **Resolution Time**: {resolve_in}
-- **Resolved By**: {resolve_by}
-
-## Context
-
-### Original AI Analysis
-The AI provided this analysis when the issue was created:
+import functools
+import itertools
+import os
 
-```
-{ai_analysis or 'No AI analysis available'}
-```
+# Free-text blocks (AI analysis, resolution notes) are capped before
+# interpolation so prompt size has a deterministic upper bound; the
+# budget is tunable per deployment and read once at import
+_PROMPT_MAX_KB = int(os.getenv("AI_EVALUATOR_PROMPT_MAX_KB", "3"))
+_CAP_HEAD = _PROMPT_MAX_KB * 1024 * 2 // 3
+_CAP_TAIL = _PROMPT_MAX_KB * 1024 // 3
 
-### Resolution Notes
-Human operator provided these notes during resolution:
 
-```
-{resolution_notes or 'No resolution notes provided'}
-```
+def _cap(text: str, head: int = _CAP_HEAD, tail: int = _CAP_TAIL) -> str:
+    """Bound a free-text block, keeping its head and tail around a marker."""
+    if len(text) <= head + tail + 32:
+        return text
+    return text[:head] + "\n...[truncated]...\n" + text[-tail:]
 
-### Historical Knowledge
-{_format_knowledge(knowledge_data)}
+# Static rubric shared by every evaluation. Kept byte-identical across
+# calls so model-side prompt caching can key on it as a prefix, and so
+# it can be supplied once as the agent's system prompt.
+_STATIC_RUBRIC = """# Resolution Quality Evaluation
 
-### Zabbix Context
-{_format_zabbix(zabbix_data)}
+You are an expert technical evaluator assessing the quality of issue resolution in a network monitoring system.
 
 ## Evaluation Task
 
@@ -127,52 +92,265 @@ Provide a brief overall assessment (3-4 sentences) covering:
 Return your evaluation in the following JSON structure:
 
 ```json
-{{
-    "issue_id": {issue_id},
+{
+    "issue_id": <issue id>,
     "evaluated_at": "[ISO timestamp]",
     "model": "[model used]",
-    "metrics": {{
+    "metrics": {
         "solution_quality": [1-10],
         "adherence_to_solution": [1-10],
         "operator_effort": [1-10],
         "automation_potential": [1-10],
         "resolution_efficiency": [1-10]
-    }},
-    "analysis": {{
+    },
+    "analysis": {
         "solution_quality_notes": "...",
         "adherence_notes": "...",
         "operator_effort_notes": "...",
         "automation_recommendations": "...",
         "efficiency_notes": "..."
-    }},
+    },
     "summary": "...",
     "improvement_priority": "high|medium|low"
+}
+```
+
+Focus on actionable insights that can improve future resolutions.
+"""
+
+
+# Per-issue scaffold, parsed once at import; placeholders use the
+# issue_data key names so the payload dict can be format_map'd directly
+_CONTEXT_TEMPLATE = """## Issue #{issue_id} Details
+- **Project**: {project_identifier}
+- **Subject**: {subject}
+- **Issue Type**: {issue_type}
+- **Class ID**: {class_id}
+- **Resolution Method**: {issue_resolve_method}
+- **Resolution Time**: {issue_resolve_in}
+- **Resolved By**: {issue_resolve_by}
+
+## Context
+
+### Original AI Analysis
+The AI provided this analysis when the issue was created:
+
+```
+{ai_analysis}
+```
+
+### Resolution Notes
+Human operator provided these notes during resolution:
+
+```
+{resolution_notes}
+```
+
+### Historical Knowledge
+{knowledge}
+
+### Zabbix Context
+{zabbix}
+"""
+
+# Fallbacks for issue_data keys the template renders; merged under the
+# payload so one dict merge replaces per-field .get() calls
+_DEFAULTS = {
+    "issue_id": None,
+    "project_identifier": None,
+    "subject": None,
+    "issue_type": "unknown",
+    "class_id": "Not classified",
+    "issue_resolve_method": "unknown",
+    "issue_resolve_in": "unknown",
+    "issue_resolve_by": "unknown",
+}
+
+
+def get_static_rubric() -> str:
+    """
+    Return the static evaluation rubric.
+
+    Identical on every call, so it can be cached model-side as a prompt
+    prefix or installed once as the agent's system prompt.
+    """
+    return _STATIC_RUBRIC
+
+
+def get_dynamic_context(
+    issue_data: dict,
+    ai_analysis: str,
+    resolution_notes: str,
+    knowledge_data: dict,
+    zabbix_data: dict,
+) -> str:
+    """
+    Generate the per-issue portion of the evaluation prompt.
+
+    Everything that varies between evaluations lives here; the scoring
+    rubric itself comes from get_static_rubric().
+    """
+    fields = {**_DEFAULTS, **issue_data}
+    if not fields["class_id"]:
+        fields["class_id"] = "Not classified"
+    fields["ai_analysis"] = _cap(ai_analysis or "No AI analysis available")
+    fields["resolution_notes"] = _cap(resolution_notes or "No resolution notes provided")
+    fields["knowledge"] = _format_knowledge(knowledge_data)
+    fields["zabbix"] = _format_zabbix(zabbix_data)
+    return _CONTEXT_TEMPLATE.format_map(fields)
+
+
+def get_evaluation_prompt(
+    issue_data: dict,
+    ai_analysis: str,
+    resolution_notes: str,
+    knowledge_data: dict,
+    zabbix_data: dict,
+) -> str:
+    """
+    Generate evaluation prompt for assessing resolution quality.
+
+    This prompt is designed for a different AI model (Claude Opus) to provide
+    unbiased evaluation of how the issue was resolved. Composed as the
+    static rubric followed by the per-issue context, so the cacheable
+    prefix stays identical between calls.
+    """
+    return _STATIC_RUBRIC + "\n" + get_dynamic_context(
+        issue_data=issue_data,
+        ai_analysis=ai_analysis,
+        resolution_notes=resolution_notes,
+        knowledge_data=knowledge_data,
+        zabbix_data=zabbix_data,
+    )
+
+
+def get_batch_evaluation_prompt(issues: list[dict]) -> str:
+    """
+    Generate one evaluation prompt covering several issues.
+
+    The scoring rubric is stated once and shared by every issue block,
+    so a batch of N issues pays the rubric's tokens once instead of N
+    times. The model answers with a JSON array of per-issue evaluations.
+
+    Args:
+        issues: Dicts with issue_data, ai_analysis, resolution_notes,
+            knowledge_data and zabbix_data keys (same shapes as
+            get_evaluation_prompt arguments)
+    """
+    blocks = []
+    for index, item in enumerate(issues, 1):
+        issue_data = item["issue_data"]
+        blocks.append(f"""## Issue {index}: #{issue_data.get('issue_id')}
+- **Project**: {issue_data.get('project_identifier')}
+- **Subject**: {issue_data.get('subject')}
+- **Issue Type**: {issue_data.get('issue_type', 'unknown')}
+- **Class ID**: {issue_data.get('class_id') or 'Not classified'}
+- **Resolution Method**: {issue_data.get('issue_resolve_method', 'unknown')}
+- **Resolution Time**: {issue_data.get('issue_resolve_in', 'unknown')}
+- **Resolved By**: {issue_data.get('issue_resolve_by', 'unknown')}
+
+### Original AI Analysis
+```
+{_cap(item.get('ai_analysis') or 'No AI analysis available')}
+```
+
+### Resolution Notes
+```
+{_cap(item.get('resolution_notes') or 'No resolution notes provided')}
+```
+
+### Historical Knowledge
+{_format_knowledge(item.get('knowledge_data'))}
+
+### Zabbix Context
+{_format_zabbix(item.get('zabbix_data'))}
+""")
+
+    issue_sections = "\n".join(blocks)
+
+    return f"""# Resolution Quality Evaluation (Batch)
+
+You are an expert technical evaluator assessing the quality of issue resolution in a network monitoring system. Evaluate EACH of the {len(issues)} issues below independently.
+
+For every issue, score each metric 1-10:
+1. **Solution Quality** - accuracy and relevance of the AI's original recommendation
+2. **Adherence to Solution** - how closely the operator followed the recommendation
+3. **Operator Effort** - work required (10 = minimal effort, 1 = extensive effort)
+4. **Automation Potential** - how fully this resolution could be automated
+5. **Resolution Efficiency** - whether time and resources were used optimally
+
+{issue_sections}
+
+## Output Format
+
+Return a single JSON object with one evaluation per issue, in input order:
+
+```json
+{{
+    "evaluations": [
+        {{
+            "issue_id": <issue id>,
+            "metrics": {{
+                "solution_quality": [1-10],
+                "adherence_to_solution": [1-10],
+                "operator_effort": [1-10],
+                "automation_potential": [1-10],
+                "resolution_efficiency": [1-10]
+            }},
+            "analysis": {{
+                "solution_quality_notes": "...",
+                "adherence_notes": "...",
+                "operator_effort_notes": "...",
+                "automation_recommendations": "...",
+                "efficiency_notes": "..."
+            }},
+            "summary": "...",
+            "improvement_priority": "high|medium|low"
+        }}
+    ]
 }}
 ```
 
 Focus on actionable insights that can improve future resolutions.
 """
-    
-    return prompt
 
 
 def _format_knowledge(knowledge_data: dict | str) -> str:
     """Format knowledge data for prompt context."""
     if not knowledge_data or isinstance(knowledge_data, str):
         return knowledge_data if isinstance(knowledge_data, str) else "No historical knowledge available for this class."
-    
-    total_occurrences = knowledge_data.get("total_occurrences", 0)
-    last_seen = knowledge_data.get("last_seen", "unknown")
-    common_resolution = knowledge_data.get("common_resolution_method", "unknown")
-    avg_duration = knowledge_data.get("average_resolution_time", "unknown")
-    
-    return f"""
-- Total historical occurrences: {total_occurrences}
-- Last seen: {last_seen}
-- Common resolution method: {common_resolution}
-- Average resolution time: {avg_duration}
-- Pattern: {knowledge_data.get('pattern_summary', 'No clear pattern identified')}
-"""
+
+    # str-coerce the key fields: the MCP server can return any JSON
+    # shape here, and an unhashable value (list, dict) must degrade to
+    # its rendered form, not break the cache lookup
+    return _format_knowledge_cached(
+        str(knowledge_data.get("total_occurrences", 0)),
+        str(knowledge_data.get("last_seen", "unknown")),
+        str(knowledge_data.get("common_resolution_method", "unknown")),
+        str(knowledge_data.get("average_resolution_time", "unknown")),
+        str(knowledge_data.get("pattern_summary", "No clear pattern identified")),
+    )
+
+
+# Issues of the same class share knowledge_data, so the rendered block
+# repeats often; memoizing on the five fields skips the rebuild
+@functools.lru_cache(maxsize=256)
+def _format_knowledge_cached(
+    total: str,
+    last_seen: str,
+    common: str,
+    avg: str,
+    pattern: str,
+) -> str:
+    # One join beats chained interpolation into a multi-line literal
+    lines = [
+        f"- Total historical occurrences: {total}",
+        f"- Last seen: {last_seen}",
+        f"- Common resolution method: {common}",
+        f"- Average resolution time: {avg}",
+        f"- Pattern: {pattern}",
+    ]
+    return "\n" + "\n".join(lines) + "\n"
 
 
 def _format_zabbix(zabbix_data: dict | str) -> str:
@@ -184,8 +362,31 @@ def _format_zabbix(zabbix_data: dict | str) -> str:
         return "No Zabbix alerts in correlation window."
     
     alerts = zabbix_data.get("alerts", [])
-    return f"""
-- Correlated alerts count: {len(alerts)}
-- Time window: {zabbix_data.get('time_window', 'unknown')}
-- Related devices: {', '.join(set(a.get('host', 'unknown') for a in alerts[:5]))}
-"""
+    # Dedup the first few hosts in one pass, keeping first-seen order
+    # (islice avoids the alerts[:5] slice copy)
+    hosts = []
+    seen = set()
+    for alert in itertools.islice(alerts, 5):
+        host = str(alert.get("host", "unknown"))
+        if host not in seen:
+            seen.add(host)
+            hosts.append(host)
+    return _format_zabbix_cached(
+        len(alerts),
+        str(zabbix_data.get("time_window", "unknown")),
+        tuple(hosts),
+    )
+
+
+@functools.lru_cache(maxsize=256)
+def _format_zabbix_cached(
+    alert_count: int,
+    time_window: str,
+    hosts: tuple[str, ...],
+) -> str:
+    lines = [
+        f"- Correlated alerts count: {alert_count}",
+        f"- Time window: {time_window}",
+        f"- Related devices: {', '.join(hosts)}",
+    ]
+    return "\n" + "\n".join(lines) + "\n"
@@ -3,183 +3,10 @@
 Test script to trigger manual evaluation for a Redmine issue.
 Usage:
   docker exec ai-evaluator python /app/test_evaluation.py 691332
-"""
-
-import os
-import sys
-import argparse
-import requests
-from datetime import datetime
-
-
-def fetch_issue_from_mcp(issue_id: int) -> dict:
-    """Fetch issue data from MCP server using Strands MCP client."""
-    mcp_base_url = os.getenv("MCP_BASE_URL", "http://localhost:8000/mcp/")
-    mcp_api_key = os.getenv("MCP_API_KEY", "")
-    
-    if not mcp_api_key:
-        print("❌ Error: MCP_API_KEY environment variable not set")
-        sys.exit(1)
-    
-    print(f"🔍 Fetching issue #{issue_id} from MCP server...")
-    
-    try:
-        # Import MCP client (same as ai-evaluator uses)
-        from ai_evaluator.mcp_client import MCPClient
-        import asyncio
-        import uuid
-        
-        # Create and start MCP client
-        mcp_client = MCPClient(base_url=mcp_base_url, api_key=mcp_api_key)
-        mcp_client.start()
-        
-        # Call get_redmine_issue tool (using same signature as ai-agents)
-        async def fetch():
-            tool_use_id = f"test-{issue_id}-{uuid.uuid4().hex[:8]}"
-            return await mcp_client._client.call_tool_async(
-                tool_use_id=tool_use_id,
-                name="get_redmine_issue",
-                arguments={"issue_id": issue_id, "include_journals": True, "include_attachments": False}
-            )
-        
-        result = asyncio.run(fetch())
-        
-        # Parse the MCP response (dict format)
-        if result and isinstance(result, dict) and 'content' in result and len(result['content']) > 0:
-            import json
-            text_content = result['content'][0]['text']
-            if isinstance(text_content, str):
-                issue_data = json.loads(text_content)
-            else:
-                issue_data = text_content
-                
-            print(f"✓ Found issue: {issue_data.get('subject', 'Unknown')[:60]}...")
-            mcp_client.close()
-            return issue_data
-        else:
-            print(f"❌ Error: No data returned from MCP server")
-            print(f"   Result type: {type(result)}")
-            print(f"   Result: {result}")
-            mcp_client.close()
-            sys.exit(1)
-    
-    except Exception as e:
-        print(f"❌ Error fetching issue from MCP: {e}")
-        import traceback
-        traceback.print_exc()
-        sys.exit(1)
-
-
-def build_evaluation_request(issue_data: dict) -> dict:
-    """Build evaluation request payload from Redmine issue data."""
-    # Get custom fields
-    custom_fields = {cf["id"]: cf.get("value", "") for cf in issue_data.get("custom_fields", [])}
-    
-    return {
-        "issue_id": issue_data["id"],
-        "project_id": issue_data["project"]["id"],
-        "project_identifier": issue_data["project"].get("identifier", "unknown"),
-        "subject": issue_data["subject"],
-        "description": issue_data.get("description", ""),
-        "author": issue_data.get("author", {}).get("name", "Unknown"),
-        "tracker": issue_data.get("tracker", {}).get("name", "Unknown"),
-        "status": issue_data.get("status", {}).get("name", "Unknown"),
-        "priority": issue_data.get("priority", {}).get("name", "Unknown"),
-        "created_on": issue_data.get("created_on", datetime.utcnow().isoformat()),
-        "updated_on": issue_data.get("updated_on", datetime.utcnow().isoformat()),
-        "issue_type": custom_fields.get(43, "manual"),  # Field 43 = Issue Type
-        "alarming_state": custom_fields.get(44, "false"),  # Field 44 = Alarming State
-        "class_id": custom_fields.get(45, ""),  # Field 45 = Class ID
-        "issue_resolve_method": custom_fields.get(46, ""),  # Field 46 = Resolve Method
-        "issue_resolve_in": custom_fields.get(47, ""),  # Field 47 = Resolve In
-        "issue_resolve_by": custom_fields.get(48, ""),  # Field 48 = Resolve By
-        "issue_resolve_at": custom_fields.get(49, ""),  # Field 49 = Resolve At
-        "collector_name": custom_fields.get(54, ""),  # Field 54 = Collector
-        "trigger_name": custom_fields.get(55, ""),  # Field 55 = Trigger Name
-        "known_error_id": custom_fields.get(56, ""),  # Field 56 = Known Error ID
-        "zabbix_event_id": custom_fields.get(57, ""),  # Field 57 = Zabbix Event ID
-    }
-
-
-def trigger_evaluation(issue_id: int, evaluator_url: str = "http://localhost:8002/evaluate"):
-    """Trigger evaluation for a specific issue."""
-    username = os.getenv("SERVICE_USERNAME", "evaluator")
-    password = os.getenv("SERVICE_PASSWORD", "changeme")
-    
-    # Fetch issue from MCP server
-    issue_data = fetch_issue_from_mcp(issue_id)
-    
-    # Build evaluation request
-    request_payload = build_evaluation_request(issue_data)
-    
-    print(f"\n📊 Triggering evaluation for issue #{issue_id}...")
-    print(f"   URL: {evaluator_url}")
-    print(f"   Project: {request_payload['project_identifier']}")
-    print(f"   Status: {request_payload['status']}")
-    print(f"   Type: {request_payload['issue_type']}")
-    
-    try:
-        response = requests.post(
-            evaluator_url,
-            json=request_payload,
-            auth=(username, password),
-            timeout=120  # Evaluations can take 30-60s
-        )
-        
-        response.raise_for_status()
-        result = response.json()
-        
-        print(f"\n✅ Evaluation completed!")
-        print(f"   Success: {result.get('success')}")
-        print(f"   Message: {result.get('message')}")
-        
-        if result.get("evaluation"):
-            eval_data = result["evaluation"]
-            if "metrics" in eval_data:
-                metrics = eval_data["metrics"]
-                print(f"\n📈 Evaluation Metrics:")
-                print(f"   Solution Quality: {metrics.get('solution_quality', 'N/A')}/10")
-                print(f"   Adherence to Solution: {metrics.get('adherence_to_solution', 'N/A')}/10")
-                print(f"   Operator Effort: {metrics.get('operator_effort', 'N/A')}/10")
-                print(f"   Automation Potential: {metrics.get('automation_potential', 'N/A')}/10")
-                print(f"   Resolution Efficiency: {metrics.get('resolution_efficiency', 'N/A')}/10")
-            
-            if "summary" in eval_data:
-                print(f"\n📝 Summary:")
-                print(f"   {eval_data['summary'][:200]}...")
-        
-        return result
-    
-    except requests.exceptions.Timeout:
-        print(f"\n❌ Error: Evaluation timed out after 120 seconds")
-        print(f"   Check ai-evaluator logs for details")
-        sys.exit(1)
-    
-    except requests.exceptions.RequestException as e:
-        print(f"\n❌ Error triggering evaluation: {e}")
-        if hasattr(e.response, 'text'):
-            print(f"   Response: {e.response.text[:200]}")
-        sys.exit(1)
 
+Implementation lives in ai_evaluator._trigger; this shim just dispatches.
+"""
 
 if __name__ == "__main__":
-    parser = argparse.ArgumentParser(
-        description="Trigger manual evaluation for a Redmine issue",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
-Examples:
-  # Trigger evaluation for issue
-  python test_evaluation.py 691332
-  
-  # With custom evaluator URL
-  python test_evaluation.py 691332 --url http://localhost:8002/evaluate
-        """
-    )
-    
-    parser.add_argument("issue_id", type=int, help="Redmine issue ID to evaluate")
-    parser.add_argument("--url", "-u", default="http://localhost:8002/evaluate", 
-                        help="Evaluator service URL (default: http://localhost:8002/evaluate)")
-    
-    args = parser.parse_args()
-    
-    trigger_evaluation(args.issue_id, args.url)
+    from ai_evaluator._trigger import main
+    main()
@@ -0,0 +1,186 @@
+"""Tests for ClickHouse client write buffering."""
+
+import asyncio
+import pytest
+from ai_evaluator.clickhouse_client import (
+    AsyncWriteBuffer,
+    ClickHouseClient,
+    _COLUMN_TYPES,
+    _FORMAT_CLAUSE_RE,
+    _INSERT_COLUMNS,
+    _to_pyformat,
+)
+
+
+def test_to_pyformat_rewrites_http_placeholders():
+    """{name:Type} placeholders become pyformat for the native driver."""
+    query = "SELECT 1 WHERE a >= now() - INTERVAL {days:UInt32} DAY AND p = {project:String} LIMIT {limit:UInt32}"
+
+    assert _to_pyformat(query) == (
+        "SELECT 1 WHERE a >= now() - INTERVAL %(days)s DAY AND p = %(project)s LIMIT %(limit)s"
+    )
+
+
+def test_format_clause_is_stripped_for_native_protocol():
+    """Trailing FORMAT directives must not reach the native server."""
+    query = "SELECT issue_id FROM ai_evaluations ORDER BY evaluated_at DESC\nFORMAT JSONCompact\n"
+
+    assert _FORMAT_CLAUSE_RE.sub("", query) == (
+        "SELECT issue_id FROM ai_evaluations ORDER BY evaluated_at DESC"
+    )
+
+
+def test_render_values_tuple_is_encoded_and_escaped():
+    """Rows are rendered as escaped, UTF-8 encoded VALUES fragments."""
+    client = ClickHouseClient(url="http://localhost:8123", user="u", password="p")
+
+    evaluation = {
+        "metrics": {"solution_quality": 8, "automation_potential": 9},
+        "analysis": {"solution_quality_notes": "operator's fix"},
+        "summary": "done",
+        "evaluated_at": "2025-01-01T00:00:00Z"
+    }
+    issue_data = {
+        "issue_id": 42,
+        "project_id": 7,
+        "project_identifier": "core",
+        "subject": "Link down on router'1"
+    }
+
+    rendered = client._render_values_tuple(evaluation, issue_data)
+
+    assert isinstance(rendered, bytes)
+    assert rendered.startswith(b"(")
+    assert rendered.endswith(b")")
+    assert b"router\\'1" in rendered
+    assert b"operator\\'s fix" in rendered
+    assert b"2025-01-01 00:00:00" in rendered
+
+
+def test_encode_row_binary_round_trip():
+    """RowBinary rows pack integers little-endian and varint-prefix strings."""
+    client = ClickHouseClient(
+        url="http://localhost:8123", user="u", password="p",
+        insert_format="rowbinary"
+    )
+
+    evaluation = {
+        "metrics": {"solution_quality": 8},
+        "analysis": {},
+        "improvement_priority": "high",
+        "evaluated_at": "2025-01-01T00:00:00Z"
+    }
+    issue_data = {"issue_id": 42, "project_id": 7, "project_identifier": "core"}
+
+    encoded = client._encode_row_binary(evaluation, issue_data)
+
+    # issue_id and project_id are UInt32 little-endian
+    assert encoded[:4] == (42).to_bytes(4, "little")
+    assert encoded[4:8] == (7).to_bytes(4, "little")
+    # project_identifier is varint length + UTF-8 bytes
+    assert encoded[8:13] == b"\x04core"
+    # no SQL quoting anywhere in the row
+    assert b"\\'" not in encoded
+
+
+def test_column_types_match_insert_columns():
+    """The type map must stay aligned with the INSERT column list."""
+    columns = _INSERT_COLUMNS.decode().split(", ")
+    assert len(columns) == len(_COLUMN_TYPES)
+
+
+async def test_write_buffer_batches_rows():
+    """Rows pushed quickly should be flushed together in one batch."""
+    flushes = []
+
+    async def flush_callback(rows):
+        flushes.append(list(rows))
+
+    buffer = AsyncWriteBuffer(flush_callback, max_rows=10, max_age_ms=100)
+
+    for i in range(3):
+        await buffer.put(f"(row{i})")
+
+    await asyncio.sleep(0.3)
+    await buffer.close()
+
+    assert len(flushes) == 1
+    assert flushes[0] == ["(row0)", "(row1)", "(row2)"]
+
+
+async def test_write_buffer_flushes_at_max_rows():
+    """Hitting max_rows should trigger a flush without waiting for max_age."""
+    flushes = []
+
+    async def flush_callback(rows):
+        flushes.append(list(rows))
+
+    buffer = AsyncWriteBuffer(flush_callback, max_rows=2, max_age_ms=10_000)
+
+    for i in range(4):
+        await buffer.put(f"(row{i})")
+
+    await asyncio.sleep(0.1)
+    await buffer.close()
+
+    assert [len(batch) for batch in flushes] == [2, 2]
+
+
+async def test_write_buffer_bounded_queue_applies_backpressure():
+    """put() should block once max_queue rows are pending."""
+    release = asyncio.Event()
+
+    async def flush_callback(rows):
+        await release.wait()
+
+    buffer = AsyncWriteBuffer(flush_callback, max_rows=1, max_age_ms=10, max_queue=2)
+
+    # First row is taken by the flusher (which parks on release),
+    # the next two fill the bounded queue
+    for i in range(3):
+        await buffer.put(f"(row{i})")
+
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(buffer.put("(row3)"), timeout=0.1)
+
+    release.set()
+    await buffer.close()
+
+
+async def test_write_buffer_close_drains_pending():
+    """close() should flush rows that never hit a threshold."""
+    flushes = []
+
+    async def flush_callback(rows):
+        flushes.append(list(rows))
+
+    buffer = AsyncWriteBuffer(flush_callback, max_rows=100, max_age_ms=60_000)
+    await buffer.put("(row0)")
+    await buffer.close()
+
+    assert ["(row0)"] in flushes
+
+
+async def test_write_buffer_close_waits_for_in_flight_flush():
+    """Rows handed to a running flush survive a concurrent close()."""
+    flushes = []
+    started = asyncio.Event()
+    release = asyncio.Event()
+
+    async def flush_callback(rows):
+        started.set()
+        await release.wait()
+        flushes.append(list(rows))
+
+    buffer = AsyncWriteBuffer(flush_callback, max_rows=1, max_age_ms=10)
+    await buffer.put("(row0)")
+    await started.wait()
+
+    close_task = asyncio.create_task(buffer.close())
+    await asyncio.sleep(0.05)
+    # close() must wait for the parked flush, not cancel it
+    assert not close_task.done()
+    release.set()
+    await close_task
+
+    assert flushes == [["(row0)"]]
@@ -0,0 +1,94 @@
+"""Tests for shared context builder."""
+
+import pytest
+from ai_evaluator import context_builder
+from ai_evaluator.context_builder import ContextBuilder
+
+
+class FakeMCPClient:
+    """Minimal MCP client stub that counts calls."""
+
+    def __init__(self):
+        self.issue_calls = 0
+        self.knowledge_calls = 0
+
+    async def get_knowledge(self, class_id, project_identifier):
+        self.knowledge_calls += 1
+        return {"class_id": class_id, "total_occurrences": 3}
+
+    async def search_zabbix_alerts(self, **kwargs):
+        raise RuntimeError("zabbix down")
+
+    async def get_redmine_issue(self, issue_id):
+        self.issue_calls += 1
+        return {
+            "issue_id": issue_id,
+            "journals": [
+                {"user": {"name": "operator"}, "created_on": "2025-01-01", "notes": "Fixed it"}
+            ]
+        }
+
+
+async def test_issue_fetch_is_cached_across_helpers():
+    """Resolution notes and AI analysis should share one MCP round-trip."""
+    mcp = FakeMCPClient()
+    builder = ContextBuilder(mcp)
+
+    notes = await builder.get_resolution_notes(123)
+    await builder.get_ai_analysis(123)
+
+    assert "Fixed it" in notes
+    assert mcp.issue_calls == 1
+
+
+async def test_build_issue_context_collects_results_and_errors():
+    """Concurrent fetches keep the result/error routing of the serial code."""
+    builder = ContextBuilder(FakeMCPClient())
+
+    context = await builder.build_issue_context({
+        "issue_id": 1,
+        "project_identifier": "core",
+        "class_id": "link_down",
+        "created_on": "2025-01-01T00:00:00Z"
+    })
+
+    assert context["knowledge"] == {"class_id": "link_down", "total_occurrences": 3}
+    assert context["zabbix"] is None
+    assert any("Zabbix fetch failed" in e for e in context["errors"])
+
+
+async def test_knowledge_fetch_is_cached_across_builds():
+    """Re-evaluating issues with the same class skips the MCP round-trip."""
+    mcp = FakeMCPClient()
+    builder = ContextBuilder(mcp)
+    issue_data = {"issue_id": 1, "project_identifier": "core", "class_id": "link_down"}
+
+    await builder.build_issue_context(issue_data, include_zabbix=False)
+    await builder.build_issue_context(issue_data, include_zabbix=False)
+
+    assert mcp.knowledge_calls == 1
+
+
+async def test_different_issues_fetch_separately():
+    """The cache is keyed per issue."""
+    mcp = FakeMCPClient()
+    builder = ContextBuilder(mcp)
+
+    await builder.get_resolution_notes(1)
+    await builder.get_resolution_notes(2)
+
+    assert mcp.issue_calls == 2
+
+
+async def test_issue_cache_stays_bounded(monkeypatch):
+    """Oldest entries and their locks are evicted beyond the cap."""
+    monkeypatch.setattr(context_builder, "_CACHE_MAX", 2)
+    builder = ContextBuilder(FakeMCPClient())
+
+    for issue_id in range(5):
+        await builder.get_resolution_notes(issue_id)
+
+    assert len(builder._issue_cache) == 2
+    assert len(builder._issue_locks) == 2
+    # The most recent issues survive
+    assert set(builder._issue_cache) == {3, 4}
@@ -0,0 +1,135 @@
+"""Tests for evaluation response parsing."""
+
+from types import SimpleNamespace
+
+from ai_evaluator.evaluator import EvaluationAgent, _iter_json_candidates, _select_tools
+
+
+class _BatchHost:
+    """Stand-in exposing only what evaluate_batch touches on self."""
+
+    model_arn = "test-model"
+
+    def __init__(self, parsed):
+        self._parsed = parsed
+        self.agent = SimpleNamespace(invoke_async=self._invoke)
+
+    async def _invoke(self, prompt):
+        return "unused"
+
+    async def _build_context(self, issue_data):
+        return {
+            "ai_analysis": "analysis",
+            "resolution_notes": "notes",
+            "knowledge_data": {},
+            "zabbix_data": {},
+        }
+
+    def _parse_evaluation(self, response):
+        return self._parsed
+
+
+class FakeTool:
+    """Tool stub with the name/spec shape the selector inspects."""
+
+    def __init__(self, name, description=""):
+        self.tool_name = name
+        self.tool_spec = {"description": description}
+
+
+def _candidates(text: str):
+    return [c.decode() for c in _iter_json_candidates(text.encode("utf-8"))]
+
+
+def test_candidates_extract_balanced_object():
+    """A plain JSON payload yields exactly one candidate."""
+    assert _candidates('{"metrics": {"solution_quality": 8}}') == [
+        '{"metrics": {"solution_quality": 8}}'
+    ]
+
+
+def test_candidates_ignore_braces_in_strings_and_prose():
+    """Braces inside string values and trailing prose don't break the scan."""
+    text = 'Here is the result:\n{"summary": "set {x} on node"}\nDone }'
+    assert _candidates(text) == ['{"summary": "set {x} on node"}']
+
+
+def test_candidates_skip_unparseable_then_find_json():
+    """Multiple balanced objects are all offered as candidates."""
+    text = '{not json} then {"metrics": {}}'
+    assert _candidates(text) == ['{not json}', '{"metrics": {}}']
+
+
+def test_candidates_stop_on_unbalanced_tail():
+    """An object that never closes produces no candidate."""
+    assert _candidates('prose {"metrics": {"a": 1}') == []
+
+
+def test_select_tools_prefers_domain_relevant_tools():
+    """Irrelevant tools are dropped first; order is preserved."""
+    tools = [
+        FakeTool("get_redmine_issue", "Fetch Redmine issue with journal notes"),
+        FakeTool("weather_report", "Current weather for a city"),
+        FakeTool("search_zabbix_alerts", "Search Zabbix alert history"),
+    ]
+
+    selected = _select_tools(tools, max_tools=2)
+
+    assert [t.tool_name for t in selected] == ["get_redmine_issue", "search_zabbix_alerts"]
+
+
+def test_select_tools_passes_small_inventories_through():
+    """No filtering when the inventory already fits."""
+    tools = [FakeTool("a"), FakeTool("b")]
+    assert _select_tools(tools, max_tools=8) == tools
+
+
+async def test_evaluate_batch_dispatches_by_issue_id():
+    """Batch responses are matched to issues by id, not input order."""
+    host = _BatchHost({"evaluations": [
+        {"issue_id": 2, "metrics": {"solution_quality": 9}},
+        {"issue_id": 1, "metrics": {"solution_quality": 3}},
+    ]})
+
+    results = await EvaluationAgent.evaluate_batch(
+        host, [{"issue_id": 1, "subject": "a"}, {"issue_id": 2, "subject": "b"}]
+    )
+
+    assert [r["issue_id"] for r in results] == [1, 2]
+    assert results[0]["metrics"]["solution_quality"] == 3
+    assert results[1]["metrics"]["solution_quality"] == 9
+    assert all(r["model"] == "test-model" for r in results)
+
+
+async def test_evaluate_batch_falls_back_to_positional_matching():
+    """Evaluations without ids map positionally; missing ones get an error."""
+    host = _BatchHost({"evaluations": [
+        {"metrics": {"solution_quality": 7}},
+    ]})
+
+    results = await EvaluationAgent.evaluate_batch(
+        host, [{"issue_id": 10, "subject": "a"}, {"issue_id": 11, "subject": "b"}]
+    )
+
+    assert results[0]["issue_id"] == 10
+    assert results[0]["metrics"]["solution_quality"] == 7
+    assert results[1]["issue_id"] == 11
+    assert results[1]["error"] == "missing from batch response"
+
+
+def test_text_fallback_extracts_labelled_scores():
+    """Scores near their metric labels are picked up; others keep defaults."""
+    text = (
+        "Solution Quality - Score: 8\n"
+        "Some discussion.\n"
+        "Automation Potential score is 9\n"
+        "Final score: 100\n"
+    )
+
+    evaluation = EvaluationAgent._parse_text_response(object(), text)
+
+    assert evaluation["metrics"]["solution_quality"] == 8
+    assert evaluation["metrics"]["automation_potential"] == 9
+    # Unlabelled and out-of-range scores leave the default untouched
+    assert evaluation["metrics"]["operator_effort"] == 5
+    assert evaluation["raw_response"] == text
@@ -0,0 +1,30 @@
+"""Tests for the MCP client circuit breaker."""
+
+import time
+
+from ai_evaluator.mcp_client import MCPClient
+
+
+async def test_open_circuit_short_circuits_calls():
+    """An open circuit returns an error without touching the network."""
+    client = MCPClient(base_url="http://mcp.invalid:8000/mcp/")
+    client._circuit_open_until["get_knowledge"] = time.monotonic() + 60
+
+    result = await client.call_tool("get_knowledge", {"class_id": "x"})
+
+    assert result == {"error": "circuit-open"}
+    await client.close()
+
+
+async def test_success_resets_failure_count():
+    """A successful call closes the circuit and clears the counter."""
+    client = MCPClient(base_url="http://mcp.invalid:8000/mcp/")
+    client._record_failure("get_knowledge")
+    client._record_failure("get_knowledge")
+    assert client._failures["get_knowledge"] == 2
+
+    client._record_success("get_knowledge")
+
+    assert "get_knowledge" not in client._failures
+    assert "get_knowledge" not in client._circuit_open_until
+    await client.close()
@@ -55,3 +55,46 @@ def test_prompt_with_empty_data():
     assert "Issue #456" in prompt
     assert "No AI analysis available" in prompt
     assert "No resolution notes provided" in prompt
+
+
+def test_long_free_text_is_capped():
+    """Oversized analysis text is truncated so prompt size stays bounded."""
+    issue_data = {
+        "issue_id": 789,
+        "project_identifier": "capped",
+        "subject": "Big Issue"
+    }
+
+    prompt = get_evaluation_prompt(
+        issue_data=issue_data,
+        ai_analysis="x" * 50_000,
+        resolution_notes="",
+        knowledge_data={},
+        zabbix_data={}
+    )
+
+    assert "...[truncated]..." in prompt
+    assert len(prompt) < 50_000
+
+
+def test_unhashable_context_fields_still_render():
+    """Arbitrary MCP JSON (lists, dicts) must not break the memoized formatters."""
+    issue_data = {
+        "issue_id": 321,
+        "project_identifier": "loose",
+        "subject": "Odd payload"
+    }
+
+    prompt = get_evaluation_prompt(
+        issue_data=issue_data,
+        ai_analysis="analysis",
+        resolution_notes="notes",
+        knowledge_data={"pattern_summary": ["a", "b"]},
+        zabbix_data={
+            "alerts": [{"host": {"name": "sw1"}}],
+            "time_window": {"from": "t0", "to": "t1"}
+        }
+    )
+
+    assert "['a', 'b']" in prompt
+    assert "Correlated alerts count: 1" in prompt